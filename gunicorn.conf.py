@@ -10,8 +10,10 @@ backlog = 2048
 # Worker processes - enables concurrent request handling
 # Multiple students can mark entry/exit simultaneously
 workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
-worker_class = "sync"  # Use "gevent" for even better concurrency if installed
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")  # Set to "gevent" for even better concurrency if installed
 worker_connections = 1000
+# Already one process per core: detect faces inline instead of a detection pool per worker
+os.environ.setdefault("SMART_ATTENDANCE_FACE_DETECTION_WORKERS", "0")
 max_requests = 1000  # Restart workers after 1000 requests to prevent memory leaks
 max_requests_jitter = 50  # Add randomness to prevent all workers restarting at once
 timeout = 120  # 2 minutes timeout for long-running operations (like face encoding)
@@ -47,6 +49,12 @@ def when_ready(server):
     """Called just after the server is started."""
     print(f"✅ Server ready to handle concurrent student entries/exits")
 
+def post_worker_init(worker):
+    """Start per-worker background jobs; the preloading master must not run threads."""
+    from web.wsgi import start_maintenance_thread
+
+    start_maintenance_thread()
+
 def on_reload(server):
     """Called to recycle workers."""
     print("♻️  Reloading workers...")
@@ -39,17 +39,20 @@ class AttendanceManager:
         duration = exit_dt - entry_dt
         return int(duration.total_seconds() / 60)
     
-    def determine_status(self, duration: int) -> str:
+    def determine_status(self, duration: int, minimum_duration: Optional[int] = None) -> str:
         """
         Determine attendance status based on duration
         
         Args:
             duration: Duration in minutes
+            minimum_duration: Threshold override for this call (defaults to self.minimum_duration)
         
         Returns:
             Status string: "PRESENT" or "ABSENT"
         """
-        if duration >= self.minimum_duration:
+        if minimum_duration is None:
+            minimum_duration = self.minimum_duration
+        if duration >= minimum_duration:
             return "PRESENT"
         else:
             return "ABSENT"
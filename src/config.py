@@ -35,6 +35,8 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 MODELS_DIR = os.path.join(BASE_DIR, "models")
 DATASET_PATH = os.path.join(DATA_DIR, "dataset")
+# Deleted students' image folders are renamed here, then removed in the background
+DATASET_TRASH_PATH = os.path.join(DATA_DIR, ".trash")
 ENCODINGS_PATH = os.path.join(DATA_DIR, "encodings")
 DATABASE_PATH = os.path.join(DATA_DIR, "database")
 LOGS_PATH = os.path.join(DATA_DIR, "logs")
@@ -51,6 +53,8 @@ APP_ENV = os.getenv("SMART_ATTENDANCE_ENV", "development")
 FLASK_HOST = os.getenv("SMART_ATTENDANCE_HOST", "0.0.0.0")
 FLASK_PORT = _env_int("SMART_ATTENDANCE_PORT", _env_int("PORT", 5000))
 FLASK_DEBUG = _env_bool("SMART_ATTENDANCE_DEBUG", False)
+# Serve `python web/app.py` with gevent's WSGI server instead of Werkzeug threads
+USE_GEVENT = _env_bool("SMART_ATTENDANCE_USE_GEVENT", False)
 SECRET_KEY = os.getenv("SMART_ATTENDANCE_SECRET_KEY", "change-me-in-production")
 
 # API security and traffic controls
@@ -105,6 +109,13 @@ RECOGNITION_FRAME_SCALE = _env_float("SMART_ATTENDANCE_RECOGNITION_FRAME_SCALE",
 RECOGNITION_INTERVAL_SECONDS = _env_float("SMART_ATTENDANCE_RECOGNITION_INTERVAL", 1.5)
 ENABLE_YOLO_IF_AVAILABLE = _env_bool("SMART_ATTENDANCE_ENABLE_YOLO", True)
 YOLO_CONFIDENCE_THRESHOLD = _env_float("SMART_ATTENDANCE_YOLO_CONFIDENCE", 0.25)
+# HOG detection worker processes per server process for enrollment uploads (0 = detect
+# in-process). Kept small because every web worker gets its own pool; gunicorn.conf.py sets 0.
+FACE_DETECTION_WORKERS = max(0, _env_int("SMART_ATTENDANCE_FACE_DETECTION_WORKERS", min(2, os.cpu_count() or 1)))
+# Reject recognize requests without client liveness data (kiosk deployments)
+REQUIRE_LIVENESS = _env_bool("SMART_ATTENDANCE_REQUIRE_LIVENESS", False)
+# Recent recognition results kept per worker, keyed by image digest
+RECOGNITION_CACHE_SIZE = _env_int("SMART_ATTENDANCE_RECOGNITION_CACHE_SIZE", 256)
 
 # Teacher camera policy
 CAMERA_POLICY_ALWAYS_ON = "always_on"
@@ -124,9 +135,14 @@ DEFAULT_FAIR_MOTION_THRESHOLD = _env_float("SMART_ATTENDANCE_FAIR_MOTION_THRESHO
 IMAGES_PER_STUDENT = _env_int("SMART_ATTENDANCE_IMAGES_PER_STUDENT", 20)
 IMAGE_CAPTURE_DELAY = _env_float("SMART_ATTENDANCE_IMAGE_CAPTURE_DELAY", 0.1)
 
+# Long-edge cap (px) for face detection on uploaded enrollment images
+ENROLLMENT_DETECTION_MAX_SIDE = max(1, _env_int("SMART_ATTENDANCE_ENROLLMENT_DETECTION_MAX_SIDE", 640))
+
 # Attendance settings
 MINIMUM_DURATION = _env_int("SMART_ATTENDANCE_MINIMUM_DURATION", 90)
 MAX_RECOGNITION_ATTEMPTS = _env_int("SMART_ATTENDANCE_MAX_RECOGNITION_ATTEMPTS", 3)
+# Seconds between background stale-entry cleanups (0 = only at startup)
+STALE_CLEANUP_INTERVAL_SECONDS = _env_int("SMART_ATTENDANCE_STALE_CLEANUP_INTERVAL_SECONDS", 3600)
 
 # Display settings
 FONT_SCALE = _env_float("SMART_ATTENDANCE_FONT_SCALE", 0.7)
@@ -154,7 +170,16 @@ DEFAULT_SUBJECT = SUBJECT_OPTIONS[0]
 
 # Database settings
 DB_TIMEOUT = _env_int("SMART_ATTENDANCE_DB_TIMEOUT", 10)
+# Registered-student lookups cached per worker (entries, seconds)
+STUDENT_INFO_CACHE_SIZE = _env_int("SMART_ATTENDANCE_STUDENT_INFO_CACHE_SIZE", 4096)
+STUDENT_INFO_CACHE_TTL_SECONDS = max(0, _env_int("SMART_ATTENDANCE_STUDENT_INFO_CACHE_TTL_SECONDS", 300))
 MAX_RECENT_ITEMS = _env_int("SMART_ATTENDANCE_MAX_RECENT_ITEMS", 10)
+# How long system settings may be served from memory per worker (seconds)
+SETTINGS_CACHE_TTL_SECONDS = max(0, _env_int("SMART_ATTENDANCE_SETTINGS_CACHE_TTL_SECONDS", 60))
+# How long polled read-only API responses may be replayed per worker (seconds)
+RESPONSE_CACHE_TTL_SECONDS = max(0, _env_int("SMART_ATTENDANCE_RESPONSE_CACHE_TTL_SECONDS", 15))
+# How long report/student list reads may be served from memory (seconds)
+READ_CACHE_TTL_SECONDS = max(1, _env_int("SMART_ATTENDANCE_READ_CACHE_TTL_SECONDS", 5))
 
 # Logging settings
 LOG_LEVEL = os.getenv("SMART_ATTENDANCE_LOG_LEVEL", "INFO")
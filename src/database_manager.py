@@ -4,13 +4,30 @@ import logging
 import os
 import sqlite3
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from . import config
+from .ttl_cache import TTLCache
 
 
 logger = logging.getLogger(__name__)
 
+# Column order of the attendance SELECTs below, used as the keys of as_dicts rows
+ATTENDANCE_FIELDS = (
+    "student_id", "name", "entry_time", "exit_time", "duration", "status", "date", "subject",
+)
+
+
+def _now_strings() -> Tuple[str, str]:
+    """Current (REPORT_DATE_FORMAT, REPORT_DATETIME_FORMAT) strings from one clock read."""
+    # Both formats are ISO 8601 prefixes, so isoformat() yields them without strftime
+    current_time = datetime.now().isoformat(" ", "seconds")
+    return current_time[:10], current_time
+
+
+def _attendance_row_factory(cursor: sqlite3.Cursor, row: Tuple) -> Dict[str, object]:
+    return dict(zip(ATTENDANCE_FIELDS, row))
+
 
 class _SQLiteConnectionContext:
     """Context manager that commits/rolls back and always closes the connection."""
@@ -40,6 +57,12 @@ class DatabaseManager:
 
     def __init__(self):
         self.db_path = config.DATABASE_FILE
+        # Registered students rarely change; the TTL bounds staleness across worker processes
+        self._student_info_cache = TTLCache(
+            ttl_seconds=config.STUDENT_INFO_CACHE_TTL_SECONDS,
+            maxsize=config.STUDENT_INFO_CACHE_SIZE,
+        )
+        self._last_modified_cache = TTLCache(ttl_seconds=1, maxsize=1)
         self._ensure_database_directory()
         self.create_tables()
 
@@ -59,6 +82,22 @@ class DatabaseManager:
         conn.execute("PRAGMA foreign_keys = ON")
         return _SQLiteConnectionContext(conn)
 
+    def get_last_modified(self) -> float:
+        """Newest mtime of the database and its WAL file, re-read at most once a second.
+
+        Every committed write touches one of the two files, from any process.
+        """
+        last_modified = self._last_modified_cache.get("mtime")
+        if last_modified is None:
+            last_modified = 0.0
+            for path in (self.db_path, f"{self.db_path}-wal"):
+                try:
+                    last_modified = max(last_modified, os.stat(path).st_mtime)
+                except FileNotFoundError:
+                    continue
+            self._last_modified_cache.set("mtime", last_modified)
+        return last_modified
+
     def create_tables(self):
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -250,11 +289,16 @@ class DatabaseManager:
                     (student_id, name, roll_number, registered_date),
                 )
                 conn.commit()
+            self._student_info_cache.pop(student_id)
             return True
         except sqlite3.IntegrityError:
             return False
 
     def get_student_info(self, student_id: str) -> Optional[Tuple]:
+        cached = self._student_info_cache.get(student_id)
+        if cached is not None:
+            return cached
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
@@ -264,7 +308,12 @@ class DatabaseManager:
                 """,
                 (student_id,),
             )
-            return cursor.fetchone()
+            row = cursor.fetchone()
+
+        # Only cache hits so a just-registered student is never reported missing
+        if row is not None:
+            self._student_info_cache.set(student_id, row)
+        return row
 
     def get_stale_entries(self, student_id: Optional[str] = None, max_age_hours: int = 24) -> List[Dict]:
         """
@@ -317,6 +366,8 @@ class DatabaseManager:
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            # Take the write lock up front so concurrent cleanups (one per worker) serialize
+            cursor.execute("BEGIN IMMEDIATE")
             cutoff_time = (datetime.now() - timedelta(hours=max_age_hours)).strftime(config.REPORT_DATETIME_FORMAT)
             current_time = datetime.now().strftime(config.REPORT_DATETIME_FORMAT)
             
@@ -334,95 +385,130 @@ class DatabaseManager:
             if not stale_entries:
                 return 0
             
-            cleaned_count = 0
+            exit_dt = datetime.strptime(current_time, config.REPORT_DATETIME_FORMAT)
+            exit_rows = []
+            attendance_rows = []
             for entry_id, student_id, name, entry_time, entry_date in stale_entries:
-                # Mark entry as exited
-                cursor.execute(
-                    "UPDATE entry_log SET status = 'AUTO_CLEANUP' WHERE id = ?",
-                    (entry_id,)
-                )
-                
-                # Create exit record
-                cursor.execute(
-                    """
-                    INSERT INTO exit_log (student_id, name, entry_id, exit_time, date)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
-                    (student_id, name, entry_id, current_time, entry_date)
-                )
-                
-                # If mark_as_absent, create attendance record
+                exit_rows.append((student_id, name, entry_id, current_time, entry_date))
                 if mark_as_absent:
                     entry_dt = datetime.strptime(entry_time, config.REPORT_DATETIME_FORMAT)
-                    exit_dt = datetime.strptime(current_time, config.REPORT_DATETIME_FORMAT)
                     duration = int((exit_dt - entry_dt).total_seconds() / 60)
-                    
-                    cursor.execute(
-                        """
-                        INSERT OR IGNORE INTO attendance (
-                            student_id, name, subject, entry_time, exit_time, 
-                            duration, status, date
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (student_id, name, "AUTO_CLEANUP", entry_time, current_time, 
+                    attendance_rows.append(
+                        (student_id, name, "AUTO_CLEANUP", entry_time, current_time,
                          duration, "ABSENT", entry_date)
                     )
-                
-                cleaned_count += 1
-                logger.info(f"Auto-cleanup: {name} ({student_id}) - entry from {entry_time}")
+                logger.info("Auto-cleanup: %s (%s) - entry from %s", name, student_id, entry_time)
+            
+            # Mark entries as exited
+            cursor.executemany(
+                "UPDATE entry_log SET status = 'AUTO_CLEANUP' WHERE id = ?",
+                [(row[0],) for row in stale_entries]
+            )
+            
+            # Create exit records
+            cursor.executemany(
+                """
+                INSERT INTO exit_log (student_id, name, entry_id, exit_time, date)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                exit_rows
+            )
+            
+            # If mark_as_absent, create attendance records
+            if attendance_rows:
+                cursor.executemany(
+                    """
+                    INSERT OR IGNORE INTO attendance (
+                        student_id, name, subject, entry_time, exit_time, 
+                        duration, status, date
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    attendance_rows
+                )
             
             conn.commit()
-            return cleaned_count
+            return len(stale_entries)
 
     def mark_entry(self, student_id: str, name: str, subject: Optional[str] = None) -> Optional[Dict[str, object]]:
         """Mark entry and return entry details including actual timestamp used."""
-        current_date = datetime.now().strftime(config.REPORT_DATE_FORMAT)
-        current_time = datetime.now().strftime(config.REPORT_DATETIME_FORMAT)
-        resolved_subject = (subject or "").strip() or config.DEFAULT_SUBJECT
-
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                
-                # Fast check for existing INSIDE entry before attempting insert
-                cursor.execute(
-                    """SELECT 1 FROM entry_log 
-                       WHERE student_id = ? AND date = ? AND subject = ? AND status = 'INSIDE' 
-                       LIMIT 1""",
-                    (student_id, current_date, resolved_subject)
-                )
-                if cursor.fetchone():
-                    logger.info(f"Entry already exists for {student_id} on {current_date} for {resolved_subject}")
-                    return None
-                
-                cursor.execute(
-                    """
-                    INSERT INTO entry_log (student_id, name, entry_time, date, status, subject)
-                    VALUES (?, ?, ?, ?, 'INSIDE', ?)
-                    """,
-                    (student_id, name, current_time, current_date, resolved_subject),
-                )
+                entry = self._insert_entry(cursor, student_id, name, subject)
                 conn.commit()
-                entry_id = int(cursor.lastrowid)
-                logger.info(f"Entry marked: {name} ({student_id}) - subject: {resolved_subject}")
-                return {
-                    "entry_id": entry_id,
-                    "entry_time": current_time,
-                    "date": current_date,
-                    "subject": resolved_subject
-                }
+                return entry
         except sqlite3.IntegrityError as e:
-            logger.warning(f"IntegrityError on entry for {student_id}: {e}")
+            logger.warning("IntegrityError on entry for %s: %s", student_id, e)
             return None
         except sqlite3.OperationalError as e:
-            logger.error(f"Database locked during entry for {student_id}: {e}")
+            logger.error("Database locked during entry for %s: %s", student_id, e)
             return None
 
+    def mark_entry_if_registered(
+        self, student_id: str, name: str, subject: Optional[str] = None
+    ) -> Tuple[bool, Optional[Dict[str, object]]]:
+        """Check registration and mark entry on one connection.
+
+        Returns (registered, entry) where entry is None if the student is
+        already inside for the subject.
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                if not self._student_exists(cursor, student_id):
+                    return False, None
+                entry = self._insert_entry(cursor, student_id, name, subject)
+                conn.commit()
+                return True, entry
+        except sqlite3.IntegrityError as e:
+            logger.warning("IntegrityError on entry for %s: %s", student_id, e)
+            return True, None
+        except sqlite3.OperationalError as e:
+            logger.error("Database locked during entry for %s: %s", student_id, e)
+            return True, None
+
+    @staticmethod
+    def _student_exists(cursor: sqlite3.Cursor, student_id: str) -> bool:
+        cursor.execute("SELECT 1 FROM students WHERE student_id = ? LIMIT 1", (student_id,))
+        return cursor.fetchone() is not None
+
+    def _insert_entry(
+        self, cursor: sqlite3.Cursor, student_id: str, name: str, subject: Optional[str]
+    ) -> Optional[Dict[str, object]]:
+        current_date, current_time = _now_strings()
+        resolved_subject = (subject or "").strip() or config.DEFAULT_SUBJECT
+
+        # Fast check for existing INSIDE entry before attempting insert
+        cursor.execute(
+            """SELECT 1 FROM entry_log 
+               WHERE student_id = ? AND date = ? AND subject = ? AND status = 'INSIDE' 
+               LIMIT 1""",
+            (student_id, current_date, resolved_subject)
+        )
+        if cursor.fetchone():
+            logger.info("Entry already exists for %s on %s for %s", student_id, current_date, resolved_subject)
+            return None
+        
+        cursor.execute(
+            """
+            INSERT INTO entry_log (student_id, name, entry_time, date, status, subject)
+            VALUES (?, ?, ?, ?, 'INSIDE', ?)
+            """,
+            (student_id, name, current_time, current_date, resolved_subject),
+        )
+        entry_id = int(cursor.lastrowid)
+        logger.info("Entry marked: %s (%s) - subject: %s", name, student_id, resolved_subject)
+        return {
+            "entry_id": entry_id,
+            "entry_time": current_time,
+            "date": current_date,
+            "subject": resolved_subject
+        }
+
     def mark_exit(self, student_id: str, name: str) -> Optional[Tuple[int, str, str]]:
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            current_date = datetime.now().strftime(config.REPORT_DATE_FORMAT)
-            current_time = datetime.now().strftime(config.REPORT_DATETIME_FORMAT)
+            current_date, current_time = _now_strings()
 
             cursor.execute(
                 """
@@ -466,97 +552,126 @@ class DatabaseManager:
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            current_date = datetime.now().strftime(config.REPORT_DATE_FORMAT)
-            current_time = datetime.now().strftime(config.REPORT_DATETIME_FORMAT)
-            resolved_subject = (subject or "").strip() or config.DEFAULT_SUBJECT
+            result = self._exit_and_save(cursor, student_id, name, minimum_duration, subject)
+            conn.commit()
+            return result
+
+    def mark_exit_if_registered(
+        self,
+        student_id: str,
+        name: str,
+        minimum_duration: int,
+        subject: Optional[str] = None,
+    ) -> Tuple[bool, Optional[Dict[str, object]]]:
+        """Check registration and process exit on one connection.
+
+        Returns (registered, result) where result is None if no active entry was found.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if not self._student_exists(cursor, student_id):
+                return False, None
+            result = self._exit_and_save(cursor, student_id, name, minimum_duration, subject)
+            conn.commit()
+            return True, result
 
-            # First try to find entry from TODAY for the specified subject
+    def _exit_and_save(
+        self,
+        cursor: sqlite3.Cursor,
+        student_id: str,
+        name: str,
+        minimum_duration: int,
+        subject: Optional[str],
+    ) -> Optional[Dict[str, object]]:
+        current_date, current_time = _now_strings()
+        resolved_subject = (subject or "").strip() or config.DEFAULT_SUBJECT
+
+        # First try to find entry from TODAY for the specified subject
+        cursor.execute(
+            """
+            SELECT id, entry_time, date FROM entry_log
+            WHERE student_id = ? AND date = ? AND subject = ? AND status = 'INSIDE'
+            ORDER BY id DESC LIMIT 1
+            """,
+            (student_id, current_date, resolved_subject),
+        )
+        entry_record = cursor.fetchone()
+
+        # If not found, check for YESTERDAY'S entry (cross-midnight case)
+        if not entry_record:
+            yesterday = (datetime.now() - timedelta(days=1)).strftime(config.REPORT_DATE_FORMAT)
             cursor.execute(
                 """
                 SELECT id, entry_time, date FROM entry_log
                 WHERE student_id = ? AND date = ? AND subject = ? AND status = 'INSIDE'
                 ORDER BY id DESC LIMIT 1
                 """,
-                (student_id, current_date, resolved_subject),
+                (student_id, yesterday, resolved_subject),
             )
             entry_record = cursor.fetchone()
-            
-            # If not found, check for YESTERDAY'S entry (cross-midnight case)
-            if not entry_record:
-                yesterday = (datetime.now() - timedelta(days=1)).strftime(config.REPORT_DATE_FORMAT)
-                cursor.execute(
-                    """
-                    SELECT id, entry_time, date FROM entry_log
-                    WHERE student_id = ? AND date = ? AND subject = ? AND status = 'INSIDE'
-                    ORDER BY id DESC LIMIT 1
-                    """,
-                    (student_id, yesterday, resolved_subject),
-                )
-                entry_record = cursor.fetchone()
-                
-                if entry_record:
-                    logger.warning(
-                        f"Cross-midnight exit detected: {name} ({student_id}) entered on {yesterday}, exiting on {current_date}"
-                    )
-            
-            if not entry_record:
-                return None
 
-            entry_id, entry_time, entry_date = entry_record
-            entry_dt = datetime.strptime(entry_time, config.REPORT_DATETIME_FORMAT)
-            exit_dt = datetime.strptime(current_time, config.REPORT_DATETIME_FORMAT)
-            if exit_dt < entry_dt:
+            if entry_record:
                 logger.warning(
-                    "Skipping exit for %s due to invalid times (entry=%s, exit=%s)",
-                    student_id,
-                    entry_time,
-                    current_time,
+                    f"Cross-midnight exit detected: {name} ({student_id}) entered on {yesterday}, exiting on {current_date}"
                 )
-                return None
 
-            duration = int((exit_dt - entry_dt).total_seconds() / 60)
-            status = "PRESENT" if duration >= minimum_duration else "ABSENT"
-            date = entry_time.split()[0]
+        if not entry_record:
+            return None
 
-            cursor.execute(
-                "UPDATE entry_log SET status = 'EXITED' WHERE id = ?",
-                (entry_id,),
-            )
-            cursor.execute(
-                """
-                INSERT INTO exit_log (student_id, name, entry_id, exit_time, date)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (student_id, name, entry_id, current_time, current_date),
-            )
-            cursor.execute(
-                """
-                INSERT INTO attendance (
-                    student_id, name, entry_time, exit_time, duration, status, date, subject
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    student_id,
-                    name,
-                    entry_time,
-                    current_time,
-                    duration,
-                    status,
-                    date,
-                    resolved_subject,
-                ),
+        entry_id, entry_time, entry_date = entry_record
+        entry_dt = datetime.strptime(entry_time, config.REPORT_DATETIME_FORMAT)
+        exit_dt = datetime.strptime(current_time, config.REPORT_DATETIME_FORMAT)
+        if exit_dt < entry_dt:
+            logger.warning(
+                "Skipping exit for %s due to invalid times (entry=%s, exit=%s)",
+                student_id,
+                entry_time,
+                current_time,
             )
-            conn.commit()
+            return None
 
-            return {
-                "entry_id": entry_id,
-                "entry_time": entry_time,
-                "exit_time": current_time,
-                "duration": duration,
-                "status": status,
-                "date": date,
-                "subject": resolved_subject,
-            }
+        duration = int((exit_dt - entry_dt).total_seconds() / 60)
+        status = "PRESENT" if duration >= minimum_duration else "ABSENT"
+        date = entry_time.split()[0]
+
+        cursor.execute(
+            "UPDATE entry_log SET status = 'EXITED' WHERE id = ?",
+            (entry_id,),
+        )
+        cursor.execute(
+            """
+            INSERT INTO exit_log (student_id, name, entry_id, exit_time, date)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (student_id, name, entry_id, current_time, current_date),
+        )
+        cursor.execute(
+            """
+            INSERT INTO attendance (
+                student_id, name, entry_time, exit_time, duration, status, date, subject
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                student_id,
+                name,
+                entry_time,
+                current_time,
+                duration,
+                status,
+                date,
+                resolved_subject,
+            ),
+        )
+
+        return {
+            "entry_id": entry_id,
+            "entry_time": entry_time,
+            "exit_time": current_time,
+            "duration": duration,
+            "status": status,
+            "date": date,
+            "subject": resolved_subject,
+        }
 
     def save_attendance(
         self,
@@ -602,6 +717,42 @@ class DatabaseManager:
             logger.exception("Error saving attendance")
             return False
 
+    @staticmethod
+    def _upsert_attendance(
+        cursor: sqlite3.Cursor,
+        student_id: str,
+        name: str,
+        entry_time: str,
+        exit_time: str,
+        duration: int,
+        status: str,
+        date: str,
+        subject: str,
+    ) -> None:
+        cursor.execute(
+            """
+            INSERT INTO attendance (
+                student_id, name, entry_time, exit_time, duration, status, date, subject
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(student_id, date, entry_time) DO UPDATE SET
+                name = excluded.name,
+                exit_time = excluded.exit_time,
+                duration = excluded.duration,
+                status = excluded.status,
+                subject = excluded.subject
+            """,
+            (
+                student_id,
+                name,
+                entry_time,
+                exit_time,
+                duration,
+                status,
+                date,
+                subject,
+            ),
+        )
+
     def upsert_attendance(
         self,
         student_id: str,
@@ -616,28 +767,8 @@ class DatabaseManager:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    INSERT INTO attendance (
-                        student_id, name, entry_time, exit_time, duration, status, date, subject
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(student_id, date, entry_time) DO UPDATE SET
-                        name = excluded.name,
-                        exit_time = excluded.exit_time,
-                        duration = excluded.duration,
-                        status = excluded.status,
-                        subject = excluded.subject
-                    """,
-                    (
-                        student_id,
-                        name,
-                        entry_time,
-                        exit_time,
-                        duration,
-                        status,
-                        date,
-                        subject,
-                    ),
+                self._upsert_attendance(
+                    cursor, student_id, name, entry_time, exit_time, duration, status, date, subject
                 )
                 conn.commit()
             return True
@@ -645,11 +776,42 @@ class DatabaseManager:
             logger.exception("Error upserting attendance")
             return False
 
+    def upsert_attendance_if_registered(
+        self,
+        student_id: str,
+        name: str,
+        entry_time: str,
+        exit_time: str,
+        duration: int,
+        status: str,
+        date: str,
+        subject: str = config.DEFAULT_SUBJECT,
+    ) -> Tuple[bool, bool]:
+        """Check registration and upsert attendance in one transaction.
+
+        Returns (registered, saved).
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                if not self._student_exists(cursor, student_id):
+                    return False, False
+                self._upsert_attendance(
+                    cursor, student_id, name, entry_time, exit_time, duration, status, date, subject
+                )
+                conn.commit()
+            return True, True
+        except Exception:
+            logger.exception("Error upserting attendance")
+            return True, False
+
     def get_attendance_by_date(
-        self, date: str, subject: Optional[str] = None
-    ) -> List[Tuple]:
+        self, date: str, subject: Optional[str] = None, as_dicts: bool = False
+    ) -> List:
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            if as_dicts:
+                cursor.row_factory = _attendance_row_factory
             if subject:
                 cursor.execute(
                     """
@@ -672,29 +834,86 @@ class DatabaseManager:
                 )
             return cursor.fetchall()
 
+    def get_attendance_page(
+        self,
+        date: str,
+        limit: int = config.MAX_RECENT_ITEMS,
+        offset: int = 0,
+    ) -> List[Tuple]:
+        """One page of a day's attendance, newest entry first (unlike get_attendance_by_date)."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT student_id, name, entry_time, exit_time, duration, status, date, subject
+                FROM attendance
+                WHERE date = ?
+                ORDER BY entry_time DESC
+                LIMIT ? OFFSET ?
+                """,
+                (date, limit, offset),
+            )
+            return cursor.fetchall()
+
+    def get_attendance_counts_by_date(self, date: str) -> Dict[str, int]:
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT status, COUNT(1)
+                FROM attendance
+                WHERE date = ?
+                GROUP BY status
+                """,
+                (date,),
+            )
+            counts = {status: int(count) for status, count in cursor.fetchall()}
+
+        return {
+            "total": sum(counts.values()),
+            "present": counts.get("PRESENT", 0),
+            "absent": counts.get("ABSENT", 0),
+        }
+
+    def _select_all_attendance(self, cursor: sqlite3.Cursor, subject: Optional[str]) -> None:
+        if subject:
+            cursor.execute(
+                """
+                SELECT student_id, name, entry_time, exit_time, duration, status, date, subject
+                FROM attendance
+                WHERE subject = ?
+                ORDER BY date DESC, entry_time DESC
+                """,
+                (subject,),
+            )
+        else:
+            cursor.execute(
+                """
+                SELECT student_id, name, entry_time, exit_time, duration, status, date, subject
+                FROM attendance
+                ORDER BY date DESC, entry_time DESC
+                """
+            )
+
     def get_all_attendance(self, subject: Optional[str] = None) -> List[Tuple]:
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            if subject:
-                cursor.execute(
-                    """
-                    SELECT student_id, name, entry_time, exit_time, duration, status, date, subject
-                    FROM attendance
-                    WHERE subject = ?
-                    ORDER BY date DESC, entry_time DESC
-                    """,
-                    (subject,),
-                )
-            else:
-                cursor.execute(
-                    """
-                    SELECT student_id, name, entry_time, exit_time, duration, status, date, subject
-                    FROM attendance
-                    ORDER BY date DESC, entry_time DESC
-                    """
-                )
+            self._select_all_attendance(cursor, subject)
             return cursor.fetchall()
 
+    def iter_all_attendance(
+        self, subject: Optional[str] = None, batch_size: int = 1000
+    ) -> Iterator[List[Tuple]]:
+        """Yield all attendance rows in fetchmany batches instead of one full list."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            self._select_all_attendance(cursor, subject)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield rows
+
     def get_attendance_filtered(
         self,
         date: Optional[str] = None,
@@ -703,7 +922,8 @@ class DatabaseManager:
         subject: Optional[str] = None,
         limit: int = config.DEFAULT_PAGE_LIMIT,
         offset: int = 0,
-    ) -> Tuple[List[Tuple], int]:
+        as_dicts: bool = False,
+    ) -> Tuple[List, int]:
         conditions: List[str] = []
         params: List[object] = []
 
@@ -735,6 +955,8 @@ class DatabaseManager:
             total = int(cursor.fetchone()[0])
 
             paged_params = params + [limit, offset]
+            if as_dicts:
+                cursor.row_factory = _attendance_row_factory
             cursor.execute(
                 f"""
                 SELECT student_id, name, entry_time, exit_time, duration, status, date, subject
@@ -788,8 +1010,36 @@ class DatabaseManager:
             )
             return cursor.fetchall()
 
+    def get_all_students_with_stats(self) -> List[Tuple]:
+        """Students with (total_classes, present_classes) aggregated in one query."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT
+                    s.student_id,
+                    s.name,
+                    s.roll_number,
+                    s.registered_date,
+                    COALESCE(a.total_classes, 0),
+                    COALESCE(a.present_classes, 0)
+                FROM students s
+                LEFT JOIN (
+                    SELECT
+                        student_id,
+                        COUNT(1) as total_classes,
+                        SUM(CASE WHEN status = 'PRESENT' THEN 1 ELSE 0 END) as present_classes
+                    FROM attendance
+                    GROUP BY student_id
+                ) a ON a.student_id = s.student_id
+                ORDER BY s.student_id
+                """
+            )
+            return cursor.fetchall()
+
     def delete_student(self, student_id: str) -> bool:
         """Delete a student and all associated data (attendance, entry, exit logs)."""
+        self._student_info_cache.pop(student_id)
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
@@ -807,10 +1057,10 @@ class DatabaseManager:
                 cursor.execute("DELETE FROM students WHERE student_id = ?", (student_id,))
                 
                 conn.commit()
-                logger.info(f"Successfully deleted student: {student_id}")
+                logger.info("Successfully deleted student: %s", student_id)
                 return True
         except Exception as e:
-            logger.exception(f"Error deleting student {student_id}: {e}")
+            logger.exception("Error deleting student %s: %s", student_id, e)
             return False
 
     def get_recent_entries(self, limit: int = config.MAX_RECENT_ITEMS) -> List[Tuple]:
@@ -827,9 +1077,11 @@ class DatabaseManager:
             )
             return cursor.fetchall()
 
-    def get_recent_exits(self, limit: int = config.MAX_RECENT_ITEMS) -> List[Tuple]:
+    def get_recent_exits(self, limit: int = config.MAX_RECENT_ITEMS, as_dicts: bool = False) -> List:
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            if as_dicts:
+                cursor.row_factory = _attendance_row_factory
             cursor.execute(
                 """
                 SELECT student_id, name, entry_time, exit_time, duration, status, date, subject
@@ -887,9 +1139,12 @@ class DatabaseManager:
         student_id: str,
         subject: Optional[str] = None,
         limit: int = 100,
-    ) -> List[Tuple]:
+        as_dicts: bool = False,
+    ) -> List:
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            if as_dicts:
+                cursor.row_factory = _attendance_row_factory
             if subject:
                 cursor.execute(
                     """
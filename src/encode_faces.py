@@ -72,6 +72,10 @@ class FaceEncoder:
         print(f"Encoding Model: {self.encoding_model}")
         print("-"*60)
         
+        # Start from a clean slate - the encoder may be reused across runs
+        self.known_encodings = []
+        self.known_names = []
+        
         # Load dataset
         image_paths = self.load_dataset()
         
@@ -170,15 +174,18 @@ class FaceEncoder:
             print(f"✗ Error saving encodings: {e}")
             return False
     
-    def encode_single_student(self, student_id):
+    def encode_single_student(self, student_id, return_encodings=False):
         """Encode faces for a single new student and append to existing encodings.
         This is MUCH faster than re-encoding all students.
         
         Args:
             student_id: The student folder name (e.g., 'student_2301105473_Debasis_Behera')
+            return_encodings: Also return the student's new encodings so callers
+                can update an in-memory index without reloading the file
         
         Returns:
-            tuple: (success, num_encoded) - success boolean and number of faces encoded
+            tuple: (success, num_encoded) - success boolean and number of faces encoded,
+                plus the list of new encodings when return_encodings is True
         """
         print("\n" + "="*60)
         print(f"ENCODING NEW STUDENT: {student_id}")
@@ -210,7 +217,7 @@ class FaceEncoder:
         
         if not os.path.exists(student_folder):
             print(f"✗ Student folder not found: {student_folder}")
-            return False, 0
+            return (False, 0, []) if return_encodings else (False, 0)
         
         # Get all images for this student
         image_files = [f for f in os.listdir(student_folder) 
@@ -218,12 +225,13 @@ class FaceEncoder:
         
         if not image_files:
             print(f"✗ No images found for student {student_id}")
-            return False, 0
+            return (False, 0, []) if return_encodings else (False, 0)
         
         print(f"Found {len(image_files)} images for {student_id}")
         print("-"*60)
         
         encoded_count = 0
+        new_encodings = []
         
         for img_file in image_files:
             try:
@@ -249,10 +257,11 @@ class FaceEncoder:
                         areas = [(bottom - top) * (right - left) 
                                 for top, right, bottom, left in face_locations]
                         largest_idx = areas.index(max(areas))
-                        existing_encodings.append(encodings[largest_idx])
+                        new_encodings.append(encodings[largest_idx])
                     else:
-                        existing_encodings.append(encodings[0])
+                        new_encodings.append(encodings[0])
                     
+                    existing_encodings.append(new_encodings[-1])
                     existing_names.append(student_id)
                     encoded_count += 1
                     print(f"  ✓ Encoded: {img_file}")
@@ -270,9 +279,11 @@ class FaceEncoder:
             self.known_encodings = existing_encodings
             self.known_names = existing_names
             success = self.save_encodings()
+            if return_encodings:
+                return success, encoded_count, new_encodings
             return success, encoded_count
         
-        return False, 0
+        return (False, 0, []) if return_encodings else (False, 0)
     
     def remove_student_encodings(self, student_id):
         """Remove encodings for a deleted student without re-encoding others.
@@ -0,0 +1,127 @@
+"""Face detection for uploaded enrollment images.
+
+Kept free of Flask and database imports so spawned worker processes start quickly.
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import dlib
+import face_recognition
+import numpy as np
+
+from . import config
+
+
+logger = logging.getLogger(__name__)
+
+# Batched CNN face detection only pays off when dlib was built with CUDA
+CUDA_AVAILABLE = bool(getattr(dlib, "DLIB_USE_CUDA", False))
+
+
+# (status, jpeg_bytes, index) where status is "success", "no_face" or "invalid"
+DetectionResult = Tuple[str, Optional[bytes], int]
+
+
+_JPEG_SOI = b"\xff\xd8\xff"
+_EXIF_HEADER = b"Exif\x00\x00"
+
+
+def _stored_bytes(image_bytes: bytes, bgr: np.ndarray) -> bytes:
+    """Keep JPEG uploads as sent; re-encode other formats.
+
+    cv2.imdecode applies EXIF orientation but the encoder reads images without
+    it, so JPEGs carrying EXIF are re-encoded to bake the rotation in.
+    """
+    if image_bytes.startswith(_JPEG_SOI) and _EXIF_HEADER not in image_bytes[:65536]:
+        return image_bytes
+    return _encode_jpeg(bgr)
+
+
+def _decode_bgr(image_bytes: bytes) -> Optional[np.ndarray]:
+    try:
+        return cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+    except cv2.error:
+        return None
+
+
+def _encode_jpeg(bgr: np.ndarray) -> bytes:
+    ok, buffer = cv2.imencode(".jpg", bgr, [cv2.IMWRITE_JPEG_QUALITY, 85])
+    if not ok:
+        raise ValueError("failed to encode JPEG")
+    return buffer.tobytes()
+
+
+def _detection_rgb(bgr: np.ndarray) -> np.ndarray:
+    """Downscale large uploads for detection only - the saved image keeps full resolution."""
+    height, width = bgr.shape[:2]
+    scale = min(1.0, config.ENROLLMENT_DETECTION_MAX_SIDE / max(height, width))
+    if scale < 1.0:
+        bgr = cv2.resize(bgr, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+
+def detect_upload(index: int, image_bytes: bytes) -> DetectionResult:
+    """Decode one upload and detect faces with HOG - designed for worker processes."""
+    bgr = _decode_bgr(image_bytes)
+    if bgr is None:
+        return ("invalid", None, index)
+
+    # Detect faces using HOG (fast) with minimal upsampling for speed
+    face_locations = face_recognition.face_locations(
+        _detection_rgb(bgr),
+        model="hog",
+        number_of_times_to_upsample=0,
+    )
+    if not face_locations:
+        return ("no_face", None, index)
+    return ("success", _stored_bytes(image_bytes, bgr), index)
+
+
+def detect_uploads_batched(uploads: List[Tuple[int, bytes]]) -> List[DetectionResult]:
+    """Detect faces for all uploads with batched CNN passes on a CUDA build of dlib."""
+    results: List[DetectionResult] = []
+    decoded = []
+    for index, image_bytes in uploads:
+        bgr = _decode_bgr(image_bytes)
+        if bgr is None:
+            results.append(("invalid", None, index))
+        else:
+            decoded.append((index, image_bytes, bgr, _detection_rgb(bgr)))
+
+    # dlib only batches equally sized images, so group uploads by shape
+    groups: Dict[tuple, list] = {}
+    for item in decoded:
+        groups.setdefault(item[3].shape, []).append(item)
+
+    for group in groups.values():
+        try:
+            batch_locations = face_recognition.batch_face_locations(
+                [rgb for _, _, _, rgb in group],
+                number_of_times_to_upsample=0,
+                batch_size=min(32, len(group)),
+            )
+            group_results = [
+                ("success", _stored_bytes(image_bytes, bgr), index) if face_locations
+                else ("no_face", None, index)
+                for (index, image_bytes, bgr, _), face_locations in zip(group, batch_locations)
+            ]
+        except Exception as e:
+            # One bad image must not fail the whole upload - retry the group one by one
+            logger.warning("Batched face detection failed, detecting per image: %s", e)
+            group_results = [
+                _detect_upload_or_invalid(index, image_bytes)
+                for index, image_bytes, _, _ in group
+            ]
+        results.extend(group_results)
+
+    return results
+
+
+def _detect_upload_or_invalid(index: int, image_bytes: bytes) -> DetectionResult:
+    try:
+        return detect_upload(index, image_bytes)
+    except Exception as e:
+        logger.warning("Image processing error: %s", e)
+        return ("invalid", None, index)
@@ -3,16 +3,26 @@
 from __future__ import annotations
 
 import base64
+import logging
 import os
 import pickle
-from typing import Dict, List, Optional, Tuple
+from threading import RLock
+from typing import Callable, Dict, List, Optional, Tuple
 
 import cv2
 import face_recognition
 import numpy as np
 
 from . import config
+from .validators import ValidationError, validate_name
 
+try:
+    import faiss  # type: ignore
+except Exception:
+    faiss = None
+
+
+logger = logging.getLogger(__name__)
 
 FaceLocation = Tuple[int, int, int, int]
 
@@ -25,6 +35,13 @@ class RecognitionService:
         self.known_encodings: List[np.ndarray] = []
         self.known_names: List[str] = []
         self._encodings_mtime: Optional[float] = None
+        # Labels whose display name fails validation: kept in the index so a face closest to
+        # one is reported unknown instead of falling through to the next-nearest student
+        self._invalid_labels: frozenset = frozenset()
+        self._encoding_matrix: Optional[np.ndarray] = None
+        self._faiss_index = None
+        # Guards encodings/names/index between reloads, appends and searches
+        self._encodings_lock = RLock()
         self._yolo_model = None
         self._yolo_supported = False
         self._yolo_active = False
@@ -40,6 +57,10 @@ class RecognitionService:
     def yolo_active(self) -> bool:
         return self._yolo_active
 
+    @property
+    def encodings_mtime(self) -> Optional[float]:
+        return self._encodings_mtime
+
     def _initialize_yolo(self):
         if not config.ENABLE_YOLO_IF_AVAILABLE:
             return
@@ -70,9 +91,7 @@ class RecognitionService:
     def load_encodings(self, force: bool = False) -> bool:
         """Load or reload encodings if file changes."""
         if not os.path.exists(self.encodings_file):
-            self.known_encodings = []
-            self.known_names = []
-            self._encodings_mtime = None
+            self._set_encodings([], [], None)
             return False
 
         mtime = os.path.getmtime(self.encodings_file)
@@ -83,15 +102,135 @@ class RecognitionService:
             with open(self.encodings_file, "rb") as file_handle:
                 data = pickle.load(file_handle)
 
-            self.known_encodings = data.get("encodings", [])
-            self.known_names = data.get("names", [])
-            self._encodings_mtime = mtime
+            encodings = data.get("encodings", [])
+            names = data.get("names", [])
+            self._set_encodings(encodings, names, mtime, self._find_invalid_labels(names))
             return bool(self.known_encodings)
         except Exception:
-            self.known_encodings = []
-            self.known_names = []
-            self._encodings_mtime = None
+            self._set_encodings([], [], None)
+            return False
+
+    def file_mtime(self) -> Optional[float]:
+        """Current on-disk mtime of the encodings file, or None if it is missing."""
+        try:
+            return os.path.getmtime(self.encodings_file)
+        except OSError:
+            return None
+
+    def append_encodings(
+        self, student_id: str, encodings: List[np.ndarray], previous_mtime: Optional[float]
+    ) -> None:
+        """Add one student's freshly saved encodings without reloading the whole file.
+
+        ``previous_mtime`` is the file mtime read just before encoding. If it differs
+        from the loaded snapshot, another process changed the file first and the
+        rewritten pickle holds students this instance never loaded, so reload instead.
+        """
+        if not encodings:
+            return
+
+        with self._encodings_lock:
+            if previous_mtime is None or previous_mtime != self._encodings_mtime:
+                self.load_encodings(force=True)
+                return
+
+            if self._label_is_valid(student_id):
+                self._invalid_labels = self._invalid_labels - {student_id}
+            else:
+                logger.warning("Encodings stored with invalid student label: %s", student_id)
+                self._invalid_labels = self._invalid_labels | {student_id}
+
+            if student_id in self.known_names:
+                # Re-registration replaced this student's encodings on disk
+                kept = [
+                    (encoding, name)
+                    for encoding, name in zip(self.known_encodings, self.known_names)
+                    if name != student_id
+                ]
+                self.known_encodings = [encoding for encoding, _ in kept] + list(encodings)
+                self.known_names = [name for _, name in kept] + [student_id] * len(encodings)
+                self._build_index()
+            else:
+                new_rows = np.ascontiguousarray(np.asarray(encodings, dtype=np.float32))
+                self.known_encodings.extend(encodings)
+                self.known_names.extend([student_id] * len(encodings))
+                if self._encoding_matrix is None:
+                    self._build_index()
+                else:
+                    self._encoding_matrix = np.vstack([self._encoding_matrix, new_rows])
+                    if self._faiss_index is not None:
+                        self._faiss_index.add(new_rows)
+
+            # The encoder just rewrote the file - don't reload it on the next recognition
+            if os.path.exists(self.encodings_file):
+                self._encodings_mtime = os.path.getmtime(self.encodings_file)
+
+    @classmethod
+    def _label_is_valid(cls, student_id: str) -> bool:
+        # Same check recognition applied per match before: the display name only, so
+        # legacy or hand-made dataset folder labels keep being recognized
+        try:
+            validate_name(cls._extract_name(student_id))
+        except (ValidationError, AttributeError):
             return False
+        return True
+
+    def _find_invalid_labels(self, names: List[str]) -> frozenset:
+        """Validate each label once at load so recognition results can be used as-is."""
+        invalid = frozenset(name for name in set(names) if not self._label_is_valid(name))
+        if invalid:
+            logger.warning(
+                "Faces matching these invalid student labels will be reported as unknown: %s",
+                ", ".join(sorted(str(name) for name in invalid)),
+            )
+        return invalid
+
+    def _set_encodings(
+        self,
+        encodings: List[np.ndarray],
+        names: List[str],
+        mtime: Optional[float],
+        invalid_labels: frozenset = frozenset(),
+    ):
+        with self._encodings_lock:
+            self.known_encodings = encodings
+            self.known_names = names
+            self._invalid_labels = invalid_labels
+            self._encodings_mtime = mtime
+            self._build_index()
+
+    def _build_index(self):
+        """Stack known encodings once and index them with FAISS when it is installed."""
+        self._faiss_index = None
+        if not self.known_encodings:
+            self._encoding_matrix = None
+            return
+
+        self._encoding_matrix = np.ascontiguousarray(
+            np.asarray(self.known_encodings, dtype=np.float32)
+        )
+        if faiss is None:
+            return
+
+        try:
+            index = faiss.IndexFlatL2(self._encoding_matrix.shape[1])
+            index.add(self._encoding_matrix)
+            self._faiss_index = index
+        except Exception:
+            self._faiss_index = None
+
+    def _nearest_encodings(self, face_encodings: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (best_index, best_distance) arrays for each query encoding."""
+        queries = np.ascontiguousarray(np.asarray(face_encodings, dtype=np.float32))
+        if self._faiss_index is not None:
+            squared, indices = self._faiss_index.search(queries, 1)
+            return indices[:, 0], np.sqrt(np.maximum(squared[:, 0], 0.0))
+
+        distances = np.linalg.norm(
+            self._encoding_matrix[np.newaxis, :, :] - queries[:, np.newaxis, :], axis=2
+        )
+        best = np.argmin(distances, axis=1)
+        return best, distances[np.arange(len(best)), best]
 
     def decode_base64_image(self, image_data: str) -> Optional[np.ndarray]:
         """Decode a browser-captured base64 image into an OpenCV frame."""
@@ -100,10 +239,15 @@ class RecognitionService:
 
         encoded = image_data.split(",", 1)[1] if "," in image_data else image_data
         try:
-            image_bytes = base64.b64decode(encoded)
+            return self.decode_image_bytes(base64.b64decode(encoded))
+        except Exception:
+            return None
+
+    def decode_image_bytes(self, image_bytes: bytes) -> Optional[np.ndarray]:
+        """Decode already-validated image bytes into an OpenCV frame."""
+        try:
             np_bytes = np.frombuffer(image_bytes, np.uint8)
-            frame = cv2.imdecode(np_bytes, cv2.IMREAD_COLOR)
-            return frame
+            return cv2.imdecode(np_bytes, cv2.IMREAD_COLOR)
         except Exception:
             return None
 
@@ -113,6 +257,12 @@ class RecognitionService:
             return None
         return self.recognize_from_frame(frame)
 
+    def recognize_from_bytes(self, image_bytes: bytes) -> Optional[Dict]:
+        frame = self.decode_image_bytes(image_bytes)
+        if frame is None:
+            return None
+        return self.recognize_from_frame(frame)
+
     def recognize_from_frame(self, frame: np.ndarray) -> Optional[Dict]:
         if not self.load_encodings():
             return None
@@ -184,32 +334,21 @@ class RecognitionService:
         if not face_encodings:
             return None
 
-        # Try with primary tolerance first
-        for idx, (location, face_encoding) in enumerate(zip(face_locations, face_encodings)):
-            face_distances = face_recognition.face_distance(
-                self.known_encodings, face_encoding
-            )
-            if len(face_distances) == 0:
-                continue
-
-            best_idx = int(np.argmin(face_distances))
-            best_distance = float(face_distances[best_idx])
-            
-            # Primary tolerance check (strict mode uses tighter threshold)
-            threshold = config.FACE_RECOGNITION_TOLERANCE if not strict else config.FACE_RECOGNITION_TOLERANCE * 0.9
-            if best_distance <= threshold:
-                best_student_id = self.known_names[best_idx]
-                best_name = self._extract_name(best_student_id)
-                confidence = max(0.0, min(100.0, (1 - best_distance) * 100))
-                bbox = self._restore_bbox_to_original_scale(location, scale)
-                
-                return {
-                    "student_id": best_student_id,
-                    "name": best_name,
-                    "confidence": round(confidence, 2),
-                    "bbox": bbox,
-                    "distance": best_distance,
-                }
+        with self._encodings_lock:
+            if self._encoding_matrix is None:
+                return None
+            best_indices, best_distances = self._nearest_encodings(face_encodings)
+            known_names = self.known_names
+            invalid_labels = self._invalid_labels
+
+        # Try with primary tolerance first (strict mode uses tighter threshold)
+        threshold = config.FACE_RECOGNITION_TOLERANCE if not strict else config.FACE_RECOGNITION_TOLERANCE * 0.9
+        match = self._first_match(
+            face_locations, best_indices, best_distances, known_names, invalid_labels, scale,
+            lambda distance: distance <= threshold,
+        )
+        if match:
+            return match
         
         # Skip relaxed tolerance in strict mode (HOG first-pass)
         if strict:
@@ -217,31 +356,41 @@ class RecognitionService:
         
         # Try with relaxed tolerance as fallback (CNN second-pass only)
         relaxed_tolerance = min(0.60, config.FACE_RECOGNITION_TOLERANCE + 0.10)
-        
-        for location, face_encoding in zip(face_locations, face_encodings):
-            face_distances = face_recognition.face_distance(
-                self.known_encodings, face_encoding
-            )
-            if len(face_distances) == 0:
+        return self._first_match(
+            face_locations, best_indices, best_distances, known_names, invalid_labels, scale,
+            lambda distance: distance <= relaxed_tolerance and distance < 0.60,
+        )
+
+    def _first_match(
+        self,
+        face_locations: List[FaceLocation],
+        best_indices: np.ndarray,
+        best_distances: np.ndarray,
+        known_names: List[str],
+        invalid_labels: frozenset,
+        scale: float,
+        accept: Callable[[float], bool],
+    ) -> Optional[Dict]:
+        for location, best_idx, best_distance in zip(face_locations, best_indices, best_distances):
+            best_distance = float(best_distance)
+            if best_idx < 0 or not accept(best_distance):
                 continue
 
-            best_idx = int(np.argmin(face_distances))
-            best_distance = float(face_distances[best_idx])
-            
-            # Relaxed tolerance check
-            if best_distance <= relaxed_tolerance and best_distance < 0.60:
-                student_id = self.known_names[best_idx]
-                name = self._extract_name(student_id)
-                confidence = max(0.0, min(100.0, (1 - best_distance) * 100))
-                bbox = self._restore_bbox_to_original_scale(location, scale)
-                
-                return {
-                    "student_id": student_id,
-                    "name": name,
-                    "confidence": round(confidence, 2),
-                    "bbox": bbox,
-                    "distance": best_distance,
-                }
+            student_id = known_names[int(best_idx)]
+            if student_id in invalid_labels:
+                # The nearest known face has an unusable label: this face is unknown
+                continue
+            name = self._extract_name(student_id)
+            confidence = max(0.0, min(100.0, (1 - best_distance) * 100))
+            bbox = self._restore_bbox_to_original_scale(location, scale)
+
+            return {
+                "student_id": student_id,
+                "name": name,
+                "confidence": round(confidence, 2),
+                "bbox": bbox,
+                "distance": best_distance,
+            }
 
         return None
 
@@ -300,7 +449,7 @@ class RecognitionService:
     def _extract_name(student_id: str) -> str:
         parts = student_id.split("_")
         if len(parts) >= 3:
-            return " ".join(parts[2:])
+            return " ".join(parts[2:]).strip()
         return student_id
 
     @staticmethod
@@ -5,7 +5,10 @@ Report generation, logging, and helper functions
 
 import os
 import csv
+import gzip
 import logging
+import shutil
+from collections import Counter
 from datetime import datetime
 from typing import List, Tuple
 from . import config
@@ -39,14 +42,14 @@ class ReportGenerator:
         Returns:
             Path to generated report file
         """
-        # Get attendance records
+        # Get attendance records (the full history is streamed in batches)
         if date:
-            records = self.db.get_attendance_by_date(date, subject=subject)
+            batches = [self.db.get_attendance_by_date(date, subject=subject)]
             if not filename:
                 suffix = f"_{subject.replace(' ', '_')}" if subject else ""
                 filename = f"attendance_report_{date}{suffix}.csv"
         else:
-            records = self.db.get_all_attendance(subject=subject)
+            batches = self.db.iter_all_attendance(subject=subject)
             if not filename:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 suffix = f"_{subject.replace(' ', '_')}" if subject else ""
@@ -66,11 +69,29 @@ class ReportGenerator:
             ])
             
             # Write records
-            for record in records:
-                writer.writerow(record)
+            for records in batches:
+                writer.writerows(records)
         
         return report_path
     
+    def write_gzip_copy(self, report_path: str) -> str:
+        """
+        Write a gzip-compressed copy next to a report for Content-Encoding downloads
+        
+        Args:
+            report_path: Path of a generated report
+        
+        Returns:
+            Path to the .gz copy
+        """
+        gz_path = report_path + ".gz"
+        tmp_path = gz_path + ".tmp"
+        with open(report_path, 'rb') as source, gzip.open(tmp_path, 'wb', compresslevel=6) as target:
+            shutil.copyfileobj(source, target)
+        # Swap in atomically so a concurrent download never sees a partial file
+        os.replace(tmp_path, gz_path)
+        return gz_path
+    
     def generate_daily_report(self, date: str = None, subject: str = None) -> str:
         """
         Generate detailed daily attendance report
@@ -93,8 +114,9 @@ class ReportGenerator:
         
         # Calculate statistics
         total_students = len(records)
-        present_count = sum(1 for r in records if r[5] == "PRESENT")
-        absent_count = sum(1 for r in records if r[5] == "ABSENT")
+        status_counts = Counter(r[5] for r in records)
+        present_count = status_counts["PRESENT"]
+        absent_count = status_counts["ABSENT"]
         
         # Write report
         with open(report_path, 'w', encoding='utf-8') as f:
@@ -171,8 +193,9 @@ class ReportGenerator:
         
         # Calculate statistics
         total_days = len(records)
-        present_days = sum(1 for r in records if r[5] == "PRESENT")
-        absent_days = sum(1 for r in records if r[5] == "ABSENT")
+        status_counts = Counter(r[5] for r in records)
+        present_days = status_counts["PRESENT"]
+        absent_days = status_counts["ABSENT"]
         total_duration = sum(r[4] for r in records)
         avg_duration = total_duration / total_days if total_days > 0 else 0
         
@@ -242,8 +265,9 @@ class ReportGenerator:
         if not records:
             print("No attendance records for today.")
         else:
-            present = sum(1 for r in records if r[5] == "PRESENT")
-            absent = sum(1 for r in records if r[5] == "ABSENT")
+            status_counts = Counter(r[5] for r in records)
+            present = status_counts["PRESENT"]
+            absent = status_counts["ABSENT"]
             total = len(records)
             
             print(f"Total Students: {total}")
@@ -3,7 +3,8 @@
 import base64
 import binascii
 import re
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache, wraps
 from typing import Optional, Tuple
 
 from . import config
@@ -18,6 +19,22 @@ _STUDENT_ID_RE = re.compile(
 )
 _NAME_RE = re.compile(r"^[A-Za-z][A-Za-z0-9 ._-]*$")
 _ROLL_RE = re.compile(r"^[A-Za-z0-9_-]+$")
+_ROLL_SEPARATORS_RE = re.compile(r'[\s\-_/.,:\(\)\[\]]+')
+_ROLL_INVALID_RE = re.compile(r'[^A-Z0-9]')
+# Order matters: compound prefixes first, then simple ones (alternation tries them in order)
+_ROLL_PREFIX_RE = re.compile(
+    r"^(?:"
+    r"ROLLNUMBER|ROLLNO|"
+    r"STUDENTNUMBER|STUDENTID|STUDENTNO|STUDENT|"
+    r"REGISTRATIONNO|REGISTRATION|"
+    r"REGNUMBER|REGNO|REG|"
+    r"IDNUMBER|IDNO|ID|"
+    r"ROLL|NUMBER|NO"
+    r")"
+)
+# Fixed-width REPORT_DATE_FORMAT / REPORT_DATETIME_FORMAT values
+_DATE_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$", re.ASCII)
+_DATETIME_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):(\d{2})$", re.ASCII)
 _STATUS_VALUES = {"PRESENT", "ABSENT"}
 _SUBJECT_VALUES = set(config.SUBJECT_OPTIONS)
 _CAMERA_RUN_MODES = {
@@ -27,6 +44,26 @@ _CAMERA_RUN_MODES = {
 }
 
 
+def _memoized(func):
+    """Cache results for string/None inputs; the wrapped validators are pure.
+
+    Failures are not cached (lru_cache does not store raised exceptions), and
+    non-hashable JSON values such as lists bypass the cache unchanged.
+    """
+    cached = lru_cache(maxsize=1024)(func)
+
+    @wraps(func)
+    def wrapper(value, *args, **kwargs):
+        if value is None or isinstance(value, str):
+            return cached(value, *args, **kwargs)
+        return func(value, *args, **kwargs)
+
+    wrapper.cache_clear = cached.cache_clear
+    wrapper.cache_info = cached.cache_info
+    return wrapper
+
+
+@_memoized
 def validate_student_id(student_id: str) -> str:
     value = (student_id or "").strip()
     if not value:
@@ -72,26 +109,13 @@ def validate_roll_number(roll_number: str) -> str:
     value = value.upper()
     
     # Remove separators FIRST to handle cases like "ROLL-NO-123" -> "ROLLNO123", then we remove "ROLLNO"
-    value = re.sub(r'[\s\-_/.,:\(\)\[\]]+', '', value)
+    value = _ROLL_SEPARATORS_RE.sub('', value)
     
     # Remove common prefix keywords (now that separators are gone)
-    # Order matters: Remove compound prefixes first, then simple ones
-    prefixes = [
-        'ROLLNUMBER', 'ROLLNO',
-        'STUDENTNUMBER', 'STUDENTID', 'STUDENTNO', 'STUDENT',
-        'REGISTRATIONNO', 'REGISTRATION',
-        'REGNUMBER', 'REGNO', 'REG',
-        'IDNUMBER', 'IDNO', 'ID',
-        'ROLL', 'NUMBER', 'NO',
-    ]
-    
-    for prefix in prefixes:
-        if value.startswith(prefix):
-            value = value[len(prefix):]
-            break  # Remove only first matching prefix
+    value = _ROLL_PREFIX_RE.sub('', value, count=1)  # Remove only first matching prefix
     
     # Remove any remaining non-alphanumeric characters
-    value = re.sub(r'[^A-Z0-9]', '', value)
+    value = _ROLL_INVALID_RE.sub('', value)
     
     # Final validation
     if not value:
@@ -102,6 +126,7 @@ def validate_roll_number(roll_number: str) -> str:
     return value
 
 
+@_memoized
 def validate_status(status: str) -> str:
     value = (status or "").strip().upper()
     if value not in _STATUS_VALUES:
@@ -109,6 +134,7 @@ def validate_status(status: str) -> str:
     return value
 
 
+@_memoized
 def validate_subject(
     subject: Optional[str],
     field_name: str = "subject",
@@ -135,17 +161,56 @@ def validate_camera_run_mode(mode: Optional[str]) -> str:
     return value
 
 
+@_memoized
 def validate_date(date_value: Optional[str], field_name: str = "date") -> Optional[str]:
     if date_value in (None, ""):
         return None
     value = date_value.strip()
+    match = _DATE_RE.match(value)
     try:
-        datetime.strptime(value, config.REPORT_DATE_FORMAT)
+        if match:
+            year, month, day = match.groups()
+            date(int(year), int(month), int(day))
+        else:
+            datetime.strptime(value, config.REPORT_DATE_FORMAT)
     except ValueError as exc:
         raise ValidationError(f"{field_name} must be in YYYY-MM-DD format") from exc
     return value
 
 
+def parse_report_datetime(value: Optional[str], field_name: str = "datetime") -> datetime:
+    """Parse a REPORT_DATETIME_FORMAT (YYYY-MM-DD HH:MM:SS) timestamp.
+
+    Fixed-width input is matched by a precompiled pattern and built directly;
+    anything else goes through strptime so loosely padded values keep working.
+    """
+    value = (value or "").strip()
+    match = _DATETIME_RE.match(value)
+    if match:
+        try:
+            return datetime(*map(int, match.groups()))
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(value, config.REPORT_DATETIME_FORMAT)
+    except ValueError as exc:
+        raise ValidationError(
+            f"{field_name} must match {config.REPORT_DATETIME_FORMAT}"
+        ) from exc
+
+
+def validate_max_age_hours(value: Optional[object], field_name: str = "max_age_hours") -> int:
+    if value in (None, ""):
+        return 24
+    try:
+        hours = int(value)
+    except (TypeError, ValueError) as exc:
+        raise ValidationError(f"{field_name} must be an integer") from exc
+    if hours < 1:
+        raise ValidationError(f"{field_name} must be >= 1")
+    return hours
+
+
 def parse_limit_offset(limit: Optional[object], offset: Optional[object]) -> Tuple[int, int]:
     parsed_limit = config.DEFAULT_PAGE_LIMIT
     parsed_offset = 0
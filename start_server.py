@@ -11,45 +11,77 @@ import sys
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-print("=" * 70)
-print("🎓 Smart Attendance System - Concurrent Mode")
-print("=" * 70)
-print()
-print("✅ Concurrent request handling enabled")
-print("✅ Multiple students can mark entry/exit simultaneously")
-print("✅ Optimized database with WAL mode and busy timeout")
-print()
-print("-" * 70)
-
-# Check if running in production or development
-is_production = os.getenv("SMART_ATTENDANCE_ENV", "development") != "development"
-
-if is_production:
-    print("🚀 Starting in PRODUCTION mode with Gunicorn...")
-    print("-" * 70)
-    
-    # Use gunicorn for production
-    from gunicorn.app.wsgiapp import run
-    sys.argv = [
-        "gunicorn",
-        "--config", "gunicorn.conf.py",
-        "web.wsgi:app"
-    ]
-    sys.exit(run())
-else:
-    print("🛠️  Starting in DEVELOPMENT mode with Flask...")
-    print("⚠️  For production, set SMART_ATTENDANCE_ENV=production")
-    print("-" * 70)
+
+def main():
+    print("=" * 70)
+    print("🎓 Smart Attendance System - Concurrent Mode")
+    print("=" * 70)
     print()
-    
-    # Use Flask development server with threading
-    from web.app import app
+    print("✅ Concurrent request handling enabled")
+    print("✅ Multiple students can mark entry/exit simultaneously")
+    print("✅ Optimized database with WAL mode and busy timeout")
+    print()
+    print("-" * 70)
+
+    # Check if running in production or development
+    is_production = os.getenv("SMART_ATTENDANCE_ENV", "development") != "development"
+
+    if is_production:
+        print("🚀 Starting in PRODUCTION mode with Gunicorn...")
+        print("-" * 70)
+
+        # Use gunicorn for production
+        from gunicorn.app.wsgiapp import run
+        sys.argv = [
+            "gunicorn",
+            "--config", "gunicorn.conf.py",
+            "web.wsgi:app"
+        ]
+        sys.exit(run())
+    else:
+        print("🛠️  Starting in DEVELOPMENT mode with Flask...")
+        print("⚠️  For production, set SMART_ATTENDANCE_ENV=production")
+        print("-" * 70)
+        print()
+
+        run_development()
+
+
+def run_development():
+    """Serve with the Flask development server (or gevent when enabled)."""
+    # gevent has to patch the stdlib before threading/socket/sqlite users are imported
+    if os.getenv("SMART_ATTENDANCE_USE_GEVENT", "").strip().lower() in {"1", "true", "yes", "on"}:
+        from gevent import monkey
+
+        monkey.patch_all()
+
+    from web.app import run_server
+
+    run_server()
+
+
+def run_waitress():
+    """Serve web/wsgi.py with Waitress."""
+    from waitress import serve
+
     import src.config as config
-    
-    app.run(
-        debug=config.FLASK_DEBUG,
-        host=config.FLASK_HOST,
-        port=config.FLASK_PORT,
-        threaded=True,  # Enable concurrent request handling
-        use_reloader=False
-    )
+    from web.wsgi import app, start_maintenance_thread
+
+    start_maintenance_thread()
+    serve(app, host=config.FLASK_HOST, port=config.FLASK_PORT)
+
+
+def run_as_main(runner):
+    """Run a launcher with this module standing in as __main__.
+
+    Spawned face detection workers re-import sys.modules["__main__"] as
+    __mp_main__. Pointing it at this guarded module keeps them from re-running
+    a launching script such as web/app.py (app, database and encodings setup).
+    """
+    sys.modules["__main__"] = sys.modules[__name__]
+    runner()
+
+
+# Guarded so spawned worker processes can import this module safely
+if __name__ == "__main__":
+    main()
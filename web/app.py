@@ -1,38 +1,67 @@
 """Flask web app for Smart Attendance Management System."""
 
-import logging
 import os
 import sys
+
+if __name__ == "__main__":
+    # Hand off to the guarded launcher before building anything: spawned face
+    # detection workers re-import the main script, and must not re-run this module
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    import start_server
+
+    start_server.run_as_main(start_server.run_development)
+    sys.exit(0)
+
+import hashlib
+import logging
+import mimetypes
+import secrets
+import shutil
+import stat
 import time
-import uuid
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
-from datetime import datetime
-from io import BytesIO
+from collections import OrderedDict
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    TimeoutError as FuturesTimeoutError,
+    as_completed,
+)
+from datetime import datetime, time as dt_time, timedelta, timezone
+from functools import lru_cache, partial, wraps
 from logging.handlers import RotatingFileHandler
+from multiprocessing import get_context
+from threading import Event, Lock, Thread
 
 import cv2
-import face_recognition
-import numpy as np
-from flask import Flask, jsonify, render_template, request, send_from_directory, g
-from PIL import Image
+from flask import Flask, jsonify, render_template, request, send_file, g, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from werkzeug.exceptions import HTTPException
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
 # Add parent directory to path for src imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import src.config as config
 from src.attendance_manager import AttendanceManager
 from src.database_manager import DatabaseManager
+from src import face_detection
 from src.encode_faces import FaceEncoder
 from src.rate_limiter import RateLimiter
 from src.recognition_service import RecognitionService
+from src.ttl_cache import TTLCache
 from src.utils import ReportGenerator
 from src.validators import (
     ValidationError,
     validate_camera_run_mode,
     parse_limit_offset,
+    parse_report_datetime,
     validate_base64_image,
     validate_date,
+    validate_max_age_hours,
     validate_name,
     validate_roll_number,
     validate_subject,
@@ -69,7 +98,27 @@ def _configure_logging():
 _configure_logging()
 logger = logging.getLogger(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Serialize responses with orjson, falling back to Flask's defaults for odd types."""
+
+    def dumps(self, obj, **kwargs):
+        option = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_SERIALIZE_NUMPY
+        )
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        # Passthrough keeps Flask's HTTP-date format for datetimes via self.default
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 app.config["SECRET_KEY"] = config.SECRET_KEY
 app.config["MAX_CONTENT_LENGTH"] = config.MAX_REQUEST_SIZE_MB * 1024 * 1024
 app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 300  # Cache static files for 5 minutes
@@ -79,6 +128,11 @@ db = DatabaseManager()
 report_gen = ReportGenerator()
 attendance_mgr = AttendanceManager()
 recognizer = RecognitionService()
+# RecognitionService loads encodings and builds the search index eagerly
+logger.info("Recognizer ready with %d known face encodings", len(recognizer.known_encodings))
+encoder = FaceEncoder()
+# FaceEncoder keeps working state on the instance - one encoding job at a time
+_encoder_lock = Lock()
 rate_limiter = RateLimiter(
     window_seconds=config.RATE_LIMIT_WINDOW_SECONDS,
     max_requests=config.RATE_LIMIT_MAX_REQUESTS,
@@ -86,16 +140,82 @@ rate_limiter = RateLimiter(
 
 PUBLIC_API_PATHS = {"/api/health"}
 
+DATASET_ROOT_ABS = os.path.abspath(config.DATASET_PATH)
+_DATASET_ROOT_PREFIX = DATASET_ROOT_ABS + os.sep
+
+# Slow filesystem/encoding cleanup handed off by request handlers
+_background_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="background")
+
+# Periodic stale-entry cleanup thread, started per serving process by start_maintenance_thread()
+_maintenance_lock = Lock()
+_maintenance_stop = Event()
+_maintenance_thread = None
+
+# Enrollment image I/O and inline detection; cv2 and file writes release the GIL
+_image_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="image")
+
+# Independent read queries issued alongside the request thread (SQLite WAL allows concurrent readers)
+_query_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="db-query")
+
+# Spawned HOG detection workers, created lazily by _get_detect_pool()
+_detect_pool = None
+_detect_pool_lock = Lock()
+
+# System settings snapshot shared across requests, keyed by the database mtime so a save
+# in any worker invalidates it
+_settings_cache = TTLCache(ttl_seconds=config.SETTINGS_CACHE_TTL_SECONDS, maxsize=1)
+# Serializes cache refills with invalidation so a refill cannot store settings older than a save
+_settings_lock = Lock()
+
+# Bodies of polled read-only API responses, cleared on every attendance/student write
+_response_cache = TTLCache(ttl_seconds=config.RESPONSE_CACHE_TTL_SECONDS, maxsize=64)
+
+# Full attendance history per subject filter (None = all subjects), one live copy each
+_attendance_cache = TTLCache(
+    ttl_seconds=config.READ_CACHE_TTL_SECONDS, maxsize=len(config.SUBJECT_OPTIONS) + 1
+)
+
+# (today's date string, epoch seconds of the next local midnight)
+_today_cache = ("", 0.0)
+
+# Last YOLO state pushed to the recognizer by _current_settings()
+_last_yolo_state = None
+
+# Recent recognition results keyed by (image digest, encodings mtime, YOLO state)
+_recent_matches = OrderedDict()
+_recent_matches_lock = Lock()
+
+
+_TRUE_STRINGS = frozenset({"1", "true", "yes", "on"})
+# Canonical spellings (as stored by db.set_setting) resolve without allocating
+_BOOL_STRINGS = {
+    **{text: True for text in _TRUE_STRINGS},
+    "True": True,
+    "0": False,
+    "false": False,
+    "False": False,
+    "no": False,
+    "off": False,
+    "": False,
+}
+
 
 def _bool_from_any(value, default=False):
     if value is None:
         return default
     if isinstance(value, bool):
         return value
-    return str(value).strip().lower() in {"1", "true", "yes", "on"}
+    if isinstance(value, str):
+        known = _BOOL_STRINGS.get(value)
+        if known is not None:
+            return known
+    return str(value).strip().lower() in _TRUE_STRINGS
 
 
 def _int_from_any(value, default=0, minimum=1):
+    # Values already typed by the JSON parser skip parsing; bool stays on the slow path
+    if type(value) is int:
+        return value if value >= minimum else minimum
     if value in (None, ""):
         return max(minimum, int(default))
     try:
@@ -106,6 +226,8 @@ def _int_from_any(value, default=0, minimum=1):
 
 
 def _float_from_any(value, default=0.0, minimum=0.0):
+    if type(value) is float:
+        return value if value >= minimum else minimum
     if value in (None, ""):
         return max(minimum, float(default))
     try:
@@ -123,16 +245,200 @@ def _json_body():
     return request.get_json(silent=True) or {}
 
 
+def validate_json(**schema):
+    """Validate JSON body fields once and pass them to the view as keyword arguments."""
+    fields = tuple(schema.items())
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            data = _json_body()
+            for key, validator in fields:
+                kwargs[key] = validator(data.get(key))
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def cached_response(view):
+    """Replay a successful JSON response for identical GETs until the TTL or a write clears it."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        # Keyed by the database mtime too, so writes from other workers also invalidate
+        key = (request.path, request.query_string, db.get_last_modified())
+        cached = _response_cache.get(key)
+        if cached is not None:
+            return app.response_class(cached, mimetype="application/json")
+
+        response = app.make_response(view(*args, **kwargs))
+        if response.status_code == 200 and response.is_json:
+            _response_cache.set(key, response.get_data())
+        return response
+
+    return wrapper
+
+
+def conditional_on_db(view):
+    """Answer If-Modified-Since polls with 304 until the database (or the day) changes."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        midnight = datetime.combine(datetime.now().date(), dt_time.min).timestamp()
+        changed_at = max(db.get_last_modified(), midnight)
+        # Last-Modified has one-second resolution; skip it while a write may share that second
+        if time.time() - changed_at < 1.0:
+            return view(*args, **kwargs)
+
+        last_modified = datetime.fromtimestamp(int(changed_at), timezone.utc)
+        since = request.if_modified_since
+        if since is not None and since >= last_modified:
+            response = app.response_class(status=304)
+        else:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.last_modified = last_modified
+        response.cache_control.no_cache = True
+        return response
+
+    return wrapper
+
+
+_optional_subject = partial(validate_subject, field_name="subject", allow_empty=True)
+
+
+def _get_detect_pool():
+    """Create the face detection process pool on first use (None runs detection inline)."""
+    global _detect_pool
+    if _detect_pool is not None or config.FACE_DETECTION_WORKERS <= 0:
+        return _detect_pool
+    with _detect_pool_lock:
+        # Concurrent first uploads must not each build (and leak) a pool
+        if _detect_pool is None:
+            try:
+                _detect_pool = ProcessPoolExecutor(
+                    max_workers=config.FACE_DETECTION_WORKERS,
+                    mp_context=get_context("spawn"),
+                )
+            except (OSError, NotImplementedError) as e:
+                logger.warning("Face detection process pool unavailable, detecting inline: %s", e)
+                return None
+    return _detect_pool
+
+
+def _detect_uploads(uploads, student_id, timeout):
+    """Run face detection for (index, image_bytes) uploads and return detection results."""
+    if not uploads:
+        return []
+    if face_detection.CUDA_AVAILABLE:
+        future = _image_executor.submit(face_detection.detect_uploads_batched, uploads)
+        try:
+            return future.result(timeout=timeout)
+        except FuturesTimeoutError:
+            logger.warning("Image processing timeout for student_id=%s", student_id)
+            return []
+
+    # Without a process pool, detect on the image threads with the same per-image handling
+    executor = _get_detect_pool() or _image_executor
+    futures = {
+        executor.submit(face_detection.detect_upload, index, image_bytes): index
+        for index, image_bytes in uploads
+    }
+    results = []
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.warning("Image processing error: %s", e)
+                results.append(("invalid", None, futures[future]))
+    except FuturesTimeoutError:
+        logger.warning("Image processing timeout for student_id=%s", student_id)
+        for future in futures:
+            future.cancel()
+    return results
+
+
 def _safe_dataset_folder(student_id: str) -> str:
-    root = os.path.abspath(config.DATASET_PATH)
-    folder = os.path.abspath(os.path.join(root, student_id))
-    if not folder.startswith(root + os.sep) and folder != root:
+    # A single plain path component can't escape the dataset root, so skip abspath
+    if (
+        not student_id
+        or student_id in (".", "..")
+        or os.sep in student_id
+        or (os.altsep and os.altsep in student_id)
+    ):
+        raise ValidationError("invalid storage path")
+    folder = os.path.join(DATASET_ROOT_ABS, student_id)
+    if not folder.startswith(_DATASET_ROOT_PREFIX):
         raise ValidationError("invalid storage path")
     return folder
 
 
+def _request_now():
+    """One clock reading per request so today/now strings always agree."""
+    now = g.get("_now")
+    if now is None:
+        now = datetime.now()
+        g._now = now
+    return now
+
+
+def _today_str():
+    """Today's date string, reformatted only once the local day rolls over."""
+    global _today_cache
+    today, expires_at = _today_cache
+    if time.time() >= expires_at:
+        now = datetime.now()
+        today = now.strftime(config.REPORT_DATE_FORMAT)
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), dt_time.min)
+        _today_cache = (today, next_midnight.timestamp())
+    return today
+
+
+def _now_str():
+    now = g.get("_now_str")
+    if now is None:
+        # Same as strftime(REPORT_DATETIME_FORMAT) without the format-string walk
+        now = _request_now().isoformat(" ", "seconds")
+        g._now_str = now
+    return now
+
+
+def _settings_cached():
+    """Fetch system settings at most once per request and once per database change."""
+    settings = g.get("_settings")
+    if settings is None:
+        key = db.get_last_modified()
+        settings = _settings_cache.get(key)
+        if settings is None:
+            with _settings_lock:
+                # Another thread may have refilled the cache while this one waited
+                settings = _settings_cache.get(key)
+                if settings is None:
+                    settings = db.get_system_settings()
+                    _settings_cache.set(key, settings)
+        g._settings = settings
+    return settings
+
+
+def _active_subject():
+    return _settings_cached().get("active_subject") or config.DEFAULT_SUBJECT
+
+
+def _sync_yolo_state(use_yolo_requested):
+    """Toggle the recognizer only when the requested YOLO state changes."""
+    global _last_yolo_state
+    if use_yolo_requested != _last_yolo_state:
+        recognizer.set_yolo_active(use_yolo_requested)
+        _last_yolo_state = use_yolo_requested
+    return recognizer.yolo_active
+
+
 def _current_settings():
-    settings = db.get_system_settings()
+    settings = _settings_cached()
     camera_policy = settings.get("camera_policy", config.DEFAULT_CAMERA_POLICY)
     camera_run_mode = settings.get("camera_run_mode", config.DEFAULT_CAMERA_RUN_MODE)
     active_subject = settings.get("active_subject", config.DEFAULT_SUBJECT)
@@ -158,7 +464,7 @@ def _current_settings():
     use_yolo_requested = _bool_from_any(
         settings.get("use_yolo"), config.ENABLE_YOLO_IF_AVAILABLE
     )
-    yolo_active = recognizer.set_yolo_active(use_yolo_requested)
+    yolo_active = _sync_yolo_state(use_yolo_requested)
     return {
         "camera_policy": camera_policy,
         "camera_run_mode": camera_run_mode,
@@ -178,7 +484,7 @@ def _current_settings():
 
 def _get_minimum_duration():
     """Get current minimum duration from database settings."""
-    settings = db.get_system_settings()
+    settings = _settings_cached()
     return _int_from_any(
         settings.get("minimum_duration_minutes"),
         config.MINIMUM_DURATION,
@@ -186,12 +492,21 @@ def _get_minimum_duration():
     )
 
 
-def _dashboard_payload():
-    today = datetime.now().strftime(config.REPORT_DATE_FORMAT)
-    records = db.get_attendance_by_date(today)
-    total = len(records)
-    present = sum(1 for record in records if record[5] == "PRESENT")
-    absent = sum(1 for record in records if record[5] == "ABSENT")
+def _dashboard_payload(page=1):
+    return _dashboard_payload_cached(_today_str(), page, _read_cache_bucket())
+
+
+@lru_cache(maxsize=4)
+def _dashboard_payload_cached(today, page, bucket):
+    counts = db.get_attendance_counts_by_date(today)
+    total = counts["total"]
+    present = counts["present"]
+    absent = counts["absent"]
+    # Pages hold MAX_RECENT_ITEMS records each, newest first; out-of-range pages show the last one
+    page_size = config.MAX_RECENT_ITEMS
+    page_count = max(1, -(-total // page_size))
+    page = min(page, page_count)
+    records = db.get_attendance_page(today, limit=page_size, offset=(page - 1) * page_size)
     return {
         "date": today,
         "total": total,
@@ -199,79 +514,77 @@ def _dashboard_payload():
         "absent": absent,
         "attendance_rate": round((present / total) * 100, 2) if total else 0,
         "records": records,
+        "page": page,
+        "page_count": page_count,
+        "first_index": (page - 1) * page_size + 1,
     }
 
 
+def _read_cache_bucket():
+    """Time bucket that expires the list caches below every READ_CACHE_TTL_SECONDS."""
+    return int(time.monotonic() // config.READ_CACHE_TTL_SECONDS)
+
+
+@lru_cache(maxsize=2)
+def _all_students_cached(bucket):
+    return db.get_all_students()
+
+
+def _all_attendance(subject=None):
+    records = _attendance_cache.get(subject)
+    if records is None:
+        records = db.get_all_attendance(subject=subject)
+        _attendance_cache.set(subject, records)
+    return records
+
+
+def _all_students():
+    return _all_students_cached(_read_cache_bucket())
+
+
+def _invalidate_entry_caches():
+    _response_cache.clear()
+
+
+def _invalidate_attendance_caches():
+    _attendance_cache.clear()
+    _dashboard_payload_cached.cache_clear()
+    _response_cache.clear()
+
+
+def _invalidate_student_caches():
+    _all_students_cached.cache_clear()
+    _attendance_cache.clear()
+    _dashboard_payload_cached.cache_clear()
+    _response_cache.clear()
+
+
+# Payload keys in the column order of the matching DatabaseManager SELECTs
+_STUDENT_KEYS = ("student_id", "name", "roll_number", "registered_date")
+_RECENT_ENTRY_KEYS = ("student_id", "name", "entry_time", "status")
+_INSIDE_KEYS = ("student_id", "name", "entry_time", "date")
+
+
 def _student_payload():
-    students = db.get_all_students()
-    return [
-        {
-            "student_id": row[0],
-            "name": row[1],
-            "roll_number": row[2],
-            "registered_date": row[3],
-        }
-        for row in students
-    ]
+    return [dict(zip(_STUDENT_KEYS, row)) for row in _all_students()]
 
 
-def _attendance_payload(records):
-    return [
-        {
-            "student_id": row[0],
-            "name": row[1],
-            "entry_time": row[2],
-            "exit_time": row[3],
-            "duration": row[4],
-            "status": row[5],
-            "date": row[6],
-            "subject": row[7] if len(row) > 7 else config.DEFAULT_SUBJECT,
-        }
-        for row in records
-    ]
+# Rows serialized per chunk when streaming large attendance listings
+_STREAM_CHUNK_ROWS = 200
 
 
 def _recent_entries_payload(limit=config.MAX_RECENT_ITEMS):
     rows = db.get_recent_entries(limit=limit)
-    return [
-        {
-            "student_id": row[0],
-            "name": row[1],
-            "entry_time": row[2],
-            "status": row[3],
-        }
-        for row in rows
-    ]
+    return [dict(zip(_RECENT_ENTRY_KEYS, row)) for row in rows]
 
 
 def _recent_exits_payload(limit=config.MAX_RECENT_ITEMS):
-    rows = db.get_recent_exits(limit=limit)
-    return [
-        {
-            "student_id": row[0],
-            "name": row[1],
-            "entry_time": row[2],
-            "exit_time": row[3],
-            "duration": row[4],
-            "status": row[5],
-            "date": row[6],
-            "subject": row[7] if len(row) > 7 else config.DEFAULT_SUBJECT,
-        }
-        for row in rows
-    ]
+    return db.get_recent_exits(limit=limit, as_dicts=True)
 
 
 def _inside_payload(limit=config.MAX_RECENT_ITEMS):
     rows = db.get_inside_students(limit=limit)
-    return [
-        {
-            "student_id": row[0],
-            "name": row[1],
-            "entry_time": row[2],
-            "date": row[3],
-        }
-        for row in rows
-    ]
+    return [dict(zip(_INSIDE_KEYS, row)) for row in rows]
 
 
 def _validate_liveness(liveness_data):
@@ -291,40 +604,63 @@ def _validate_liveness(liveness_data):
     details = liveness_data.get('details', {})
     
     # Log liveness check for audit trail
-    logger.info(f"Liveness check: isLive={is_live}, score={score}, details={details}")
+    logger.info("Liveness check: isLive=%s, score=%s, details=%s", is_live, score, details)
     
     # Very lenient validation - primarily for logging, rarely blocks
     # This ensures the system works even with mediocre liveness scores
     if not is_live:
-        logger.warning(f"Liveness not verified: score={score}, details={details}")
+        logger.warning("Liveness not verified: score=%s, details=%s", score, details)
         # Still allow if score is reasonable (not blocking anymore)
         if score < 30:  # Only block extremely low scores
-            logger.warning(f"Liveness score critically low: {score}")
+            logger.warning("Liveness score critically low: %s", score)
             return False
     
     # Just need face detection - blinks and motion are optional
     has_face = details.get('hasFaceDetection', True)  # Default true for backward compatibility
     
     if not has_face:
-        logger.warning(f"No face detected in liveness check")
+        logger.warning("No face detected in liveness check")
         # Don't block - let face recognition handle it
         return True
     
-    logger.info(f"Liveness check passed: score={score}")
+    logger.info("Liveness check passed: score=%s", score)
     return True
 
 
+def _recognize_cached(image_bytes):
+    """Recognize an image, reusing the result for byte-identical resubmissions."""
+    # Pick up encodings changed by other workers or the CLI before the mtime goes into the key
+    recognizer.load_encodings()
+    key = (
+        hashlib.blake2b(image_bytes, digest_size=16).hexdigest(),
+        recognizer.encodings_mtime,
+        recognizer.yolo_active,
+    )
+    with _recent_matches_lock:
+        if key in _recent_matches:
+            _recent_matches.move_to_end(key)
+            return _recent_matches[key]
+
+    match = recognizer.recognize_from_bytes(image_bytes)
+
+    with _recent_matches_lock:
+        _recent_matches[key] = match
+        while len(_recent_matches) > config.RECOGNITION_CACHE_SIZE:
+            _recent_matches.popitem(last=False)
+    return match
+
+
 def _recognize_or_error(image_data):
     if not image_data:
         return None, _json_error("image payload is required", 400)
 
-    validate_base64_image(image_data)
+    image_bytes = validate_base64_image(image_data)
     
     # Check if encodings are loaded
     if not recognizer.known_encodings:
         return None, _json_error("no face encodings available - please register students and generate encodings first", 503)
     
-    match = recognizer.recognize_from_base64(image_data)
+    match = _recognize_cached(image_bytes)
     if not match:
         return None, _json_error(
             "face not recognized - please ensure: (1) face is clearly visible, "
@@ -339,12 +675,13 @@ def _recognize_or_error(image_data):
 @app.before_request
 def _before_request():
     g.started_at = time.perf_counter()
-    g.request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+    g.request_id = request.headers.get("X-Request-ID") or secrets.token_hex(8)
 
-    if not request.path.startswith("/api/"):
+    # Liveness probes skip both the API key and the rate limiter
+    if not request.path.startswith("/api/") or request.path in PUBLIC_API_PATHS:
         return None
 
-    if config.REQUIRE_API_KEY and request.path not in PUBLIC_API_PATHS:
+    if config.REQUIRE_API_KEY:
         provided = request.headers.get(config.API_KEY_HEADER, "").strip()
         if not provided or provided != config.API_KEY:
             return _json_error("unauthorized", 401)
@@ -402,7 +739,7 @@ def _handle_unexpected_error(exc):
 @app.route("/")
 @app.route("/dashboard")
 def dashboard():
-    payload = _dashboard_payload()
+    payload = _dashboard_payload(_int_from_any(request.args.get("page"), 1, minimum=1))
     return render_template(
         "dashboard.html",
         stats={
@@ -413,6 +750,9 @@ def dashboard():
             "attendance_rate": payload["attendance_rate"],
         },
         records=payload["records"],
+        page=payload["page"],
+        page_count=payload["page_count"],
+        first_index=payload["first_index"],
     )
 
 
@@ -444,9 +784,9 @@ def reports_page():
     selected_subject = validate_subject(
         request.args.get("subject"), "subject", allow_empty=True
     )
-    all_records = db.get_all_attendance(subject=selected_subject)
-    students = db.get_all_students()
-    today = datetime.now().strftime(config.REPORT_DATE_FORMAT)
+    all_records = _all_attendance(selected_subject)
+    students = _all_students()
+    today = _today_str()
     return render_template(
         "reports.html",
         records=all_records,
@@ -472,6 +812,7 @@ def api_settings():
         return jsonify({"success": True, "settings": settings, "runtime": recognizer.get_runtime_info()})
 
     data = _json_body()
+    updates = {}
     camera_policy = data.get("camera_policy")
     if camera_policy is not None:
         if camera_policy not in {
@@ -479,70 +820,84 @@ def api_settings():
             config.CAMERA_POLICY_ON_DEMAND,
         }:
             raise ValidationError("invalid camera policy")
-        db.set_setting("camera_policy", camera_policy)
+        updates["camera_policy"] = camera_policy
 
     if "camera_run_mode" in data:
         run_mode = validate_camera_run_mode(data.get("camera_run_mode"))
-        db.set_setting("camera_run_mode", run_mode)
+        updates["camera_run_mode"] = run_mode
 
     if "active_subject" in data:
         active_subject = validate_subject(data.get("active_subject"))
-        db.set_setting("active_subject", active_subject)
+        updates["active_subject"] = active_subject
 
     if "run_interval_seconds" in data:
         interval_seconds = _int_from_any(data.get("run_interval_seconds"), minimum=3)
-        db.set_setting("run_interval_seconds", str(interval_seconds))
+        updates["run_interval_seconds"] = str(interval_seconds)
 
     if "session_duration_minutes" in data:
         session_minutes = _int_from_any(data.get("session_duration_minutes"), minimum=1)
-        db.set_setting("session_duration_minutes", str(session_minutes))
+        updates["session_duration_minutes"] = str(session_minutes)
 
     if "fair_motion_threshold" in data:
         motion_threshold = _float_from_any(data.get("fair_motion_threshold"), minimum=0.0)
-        db.set_setting("fair_motion_threshold", str(motion_threshold))
+        updates["fair_motion_threshold"] = str(motion_threshold)
 
     if "minimum_duration_minutes" in data:
         min_duration = _int_from_any(data.get("minimum_duration_minutes"), minimum=1)
-        db.set_setting("minimum_duration_minutes", str(min_duration))
+        updates["minimum_duration_minutes"] = str(min_duration)
 
     if "use_yolo" in data:
         use_yolo = _bool_from_any(data.get("use_yolo"))
-        db.set_setting("use_yolo", str(use_yolo).lower())
+        updates["use_yolo"] = str(use_yolo).lower()
+
+    # The snapshot is keyed by the database mtime, so it already holds other workers' saves
+    current = _settings_cached()
+    for key, value in updates.items():
+        db.set_setting(key, value)
 
+    with _settings_lock:
+        _settings_cache.clear()
+    g._settings = {**current, **updates}
     settings = _current_settings()
     return jsonify({"success": True, "settings": settings, "runtime": recognizer.get_runtime_info()})
 
 
 @app.route("/api/health")
 def api_health():
+    # Liveness probes must stay cheap and side-effect free: no settings read, no YOLO toggle.
+    # Settings are served by /api/settings.
     return jsonify(
         {
             "success": True,
-            "timestamp": datetime.now().strftime(config.REPORT_DATETIME_FORMAT),
+            "timestamp": _now_str(),
             "runtime": recognizer.get_runtime_info(),
-            "settings": _current_settings(),
         }
     )
 
 
 @app.route("/api/register-student", methods=["POST"])
-def register_student():
-    data = _json_body()
-    student_id = validate_student_id(data.get("student_id"))
-    name = validate_name(data.get("name"))
-    roll_number = validate_roll_number(data.get("roll_number"))
-
+@validate_json(
+    student_id=validate_student_id,
+    name=validate_name,
+    roll_number=validate_roll_number,
+)
+def register_student(student_id, name, roll_number):
     success = db.register_student(student_id, name, roll_number)
     if success:
+        _invalidate_student_caches()
         return jsonify({"success": True, "message": "Student registered successfully"})
     return _json_error("student_id or roll_number already exists", 409)
 
 
+def _write_bytes(path, data):
+    with open(path, "wb") as output:
+        output.write(data)
+
+
 @app.route("/api/save-face-images", methods=["POST"])
-def save_face_images():
-    data = _json_body()
-    student_id = validate_student_id(data.get("student_id"))
-    images = data.get("images") or []
+@validate_json(student_id=validate_student_id)
+def save_face_images(student_id):
+    images = _json_body().get("images") or []
 
     if not isinstance(images, list) or not images:
         raise ValidationError("at least one image is required")
@@ -554,92 +909,48 @@ def save_face_images():
     folder_path = _safe_dataset_folder(student_id)
     os.makedirs(folder_path, exist_ok=True)
 
-    saved_count = 0
     no_face_count = 0
     invalid_count = 0
-    
-    def process_single_image(index_and_payload):
-        """Process a single image for face detection - designed for parallel execution."""
-        index, image_payload = index_and_payload
+
+    # Decode base64 here so detection workers only receive raw image bytes
+    uploads = []
+    results = []
+    for index, image_payload in enumerate(images, start=1):
         try:
-            # Validate and decode base64 image
-            image_bytes = validate_base64_image(image_payload)
-            image = Image.open(BytesIO(image_bytes)).convert("RGB")
-            
-            # Convert PIL image to numpy array for face detection
-            image_np = np.array(image)
-            
-            # Detect faces using HOG (fast) with minimal upsampling for speed
-            face_locations = face_recognition.face_locations(
-                image_np, 
-                model="hog",
-                number_of_times_to_upsample=0  # Reduced from 1 for faster processing
-            )
-            
-            if len(face_locations) > 0:
-                return ("success", image, index)
-            else:
-                logger.info(f"Image {index} skipped - no face detected (student_id={student_id})")
-                return ("no_face", None, index)
-                
+            uploads.append((index, validate_base64_image(image_payload)))
         except ValidationError:
-            return ("invalid", None, index)
-        except Exception as e:
-            logger.warning("invalid image skipped at index=%s for student_id=%s: %s", index, student_id, str(e))
-            return ("invalid", None, index)
-    
-    # Process images in parallel with timeout protection
-    max_workers = min(4, len(images))  # Limit concurrent workers
+            results.append(("invalid", None, index))
+
     timeout_per_batch = 30  # 30 seconds total timeout
-    
+
     try:
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            futures = {
-                executor.submit(process_single_image, (i, img)): i 
-                for i, img in enumerate(images, start=1)
-            }
-            
-            # Collect results with timeout
-            results = []
-            start_time = time.time()
-            for future in futures:
-                remaining_time = timeout_per_batch - (time.time() - start_time)
-                if remaining_time <= 0:
-                    logger.warning(f"Image processing timeout for student_id={student_id}")
-                    break
-                    
-                try:
-                    result = future.result(timeout=remaining_time)
-                    results.append(result)
-                except FuturesTimeoutError:
-                    logger.warning(f"Image processing timeout for student_id={student_id}")
-                    break
-                except Exception as e:
-                    logger.warning(f"Image processing error: {e}")
-                    results.append(("invalid", None, futures[future]))
-                    
+        results.extend(_detect_uploads(uploads, student_id, timeout_per_batch))
     except Exception as e:
-        logger.error(f"Parallel processing failed for student_id={student_id}: {e}")
+        logger.error("Parallel processing failed for student_id=%s: %s", student_id, e)
         raise ValidationError("image processing failed - please try again with fewer images")
-    
-    # Save successfully processed images
-    for status, image, index in results:
+
+    # Name successfully processed images in upload order
+    to_save = []
+    for status, jpeg_bytes, index in sorted(results, key=lambda result: result[2]):
         if status == "success":
-            image.save(os.path.join(folder_path, f"img{saved_count + 1}.jpg"), "JPEG", quality=85)
-            saved_count += 1
+            to_save.append((os.path.join(folder_path, f"img{len(to_save) + 1}.jpg"), jpeg_bytes))
         elif status == "no_face":
+            logger.info("Image %s skipped - no face detected (student_id=%s)", index, student_id)
             no_face_count += 1
         elif status == "invalid":
             invalid_count += 1
 
+    saved_count = len(to_save)
+
     # Require at least 3 images with faces for reliable encoding
     min_required_images = 3
     if saved_count < min_required_images:
-        # Clean up any saved images if we don't have enough
+        # Nothing from this upload was written; clear images left by earlier attempts
         if os.path.exists(folder_path):
-            for file in os.listdir(folder_path):
-                os.remove(os.path.join(folder_path, file))
+            with os.scandir(folder_path) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False):
+                        os.unlink(entry.path)
         
         # Provide detailed error message with guidance
         error_parts = []
@@ -658,6 +969,10 @@ def save_face_images():
         
         raise ValidationError("\n".join(error_parts))
 
+    # Write the images concurrently instead of one after another
+    for future in [_image_executor.submit(_write_bytes, path, data) for path, data in to_save]:
+        future.result()
+
     return jsonify({
         "success": True, 
         "message": f"saved {saved_count} images with detected faces",
@@ -677,18 +992,21 @@ def encode_student(student_id):
     """
     student_id = validate_student_id(student_id)
     
-    logger.info(f"Encoding faces for student: {student_id}")
+    logger.info("Encoding faces for student: %s", student_id)
     start_time = time.time()
     
-    encoder = FaceEncoder()
-    success, num_encoded = encoder.encode_single_student(student_id)
+    with _encoder_lock:
+        previous_mtime = recognizer.file_mtime()
+        success, num_encoded, new_encodings = encoder.encode_single_student(
+            student_id, return_encodings=True
+        )
     
     elapsed = time.time() - start_time
-    logger.info(f"Student encoding completed in {elapsed:.2f}s - {num_encoded} faces encoded")
+    logger.info("Student encoding completed in %.2fs - %s faces encoded", elapsed, num_encoded)
     
     if success:
-        # Reload encodings in recognizer
-        recognizer.load_encodings(force=True)
+        # Add the new encodings in place instead of reloading every student
+        recognizer.append_encodings(student_id, new_encodings, previous_mtime)
         return jsonify({
             "success": True,
             "message": f"encoded {num_encoded} faces for {student_id}",
@@ -709,11 +1027,11 @@ def generate_encodings():
     logger.info("Starting FULL face encoding generation (all students)...")
     start_time = time.time()
     
-    encoder = FaceEncoder()
-    success = encoder.run()
+    with _encoder_lock:
+        success = encoder.run()
     
     elapsed = time.time() - start_time
-    logger.info(f"Face encoding generation completed in {elapsed:.2f}s - success={success}")
+    logger.info("Face encoding generation completed in %.2fs - success=%s", elapsed, success)
     
     if success:
         recognizer.load_encodings(force=True)
@@ -732,9 +1050,11 @@ def recognize_entry():
     liveness_data = data.get("liveness")
     subject = validate_subject(data.get("subject"), "subject", allow_empty=True)
     if not subject:
-        subject = db.get_setting("active_subject", config.DEFAULT_SUBJECT)
+        subject = _active_subject()
     
-    # Validate liveness if data is provided
+    # Validate liveness before any face embedding work
+    if config.REQUIRE_LIVENESS and not liveness_data:
+        return _json_error("liveness data is required - please enable liveness detection", 403)
     if liveness_data and not _validate_liveness(liveness_data):
         return _json_error("liveness check failed - please ensure you are a live person and blink naturally", 403)
     
@@ -742,17 +1062,18 @@ def recognize_entry():
     if error_response:
         return error_response
 
+    # Labels were validated when the encodings were loaded
     student_id = match["student_id"]
-    name = validate_name(match["name"])
+    name = match["name"]
     confidence = match["confidence"]
 
-    if not db.get_student_info(student_id):
+    registered, entry_result = db.mark_entry_if_registered(student_id, name, subject=subject)
+    if not registered:
         return _json_error("recognized student is not registered", 404)
-
-    entry_result = db.mark_entry(student_id, name, subject=subject)
     if not entry_result:
-        logger.warning(f"Entry already marked for {name} ({student_id}) - subject: {subject}")
+        logger.warning("Entry already marked for %s (%s) - subject: %s", name, student_id, subject)
         return _json_error(f"{name} is already marked inside for {subject}", 409)
+    _invalidate_entry_caches()
 
     # Use the actual timestamp from database (not a new one!)
     entry_id = entry_result["entry_id"]
@@ -762,8 +1083,8 @@ def recognize_entry():
     # Log successful entry with liveness status and subject
     liveness_status = "verified" if liveness_data else "not_checked"
     logger.info(
-        f"Entry marked: {name} ({student_id}) at {entry_time} - "
-        f"subject: {entry_subject} - liveness: {liveness_status}"
+        "Entry marked: %s (%s) at %s - subject: %s - liveness: %s",
+        name, student_id, entry_time, entry_subject, liveness_status,
     )
     
     return jsonify(
@@ -787,9 +1108,11 @@ def recognize_exit():
     liveness_data = data.get("liveness")
     subject = validate_subject(data.get("subject"), "subject", allow_empty=True)
     if not subject:
-        subject = db.get_setting("active_subject", config.DEFAULT_SUBJECT)
+        subject = _active_subject()
     
-    # Validate liveness if data is provided
+    # Validate liveness before any face embedding work
+    if config.REQUIRE_LIVENESS and not liveness_data:
+        return _json_error("liveness data is required - please enable liveness detection", 403)
     if liveness_data and not _validate_liveness(liveness_data):
         return _json_error("liveness check failed - please ensure you are a live person and blink naturally", 403)
     
@@ -797,31 +1120,32 @@ def recognize_exit():
     if error_response:
         return error_response
 
+    # Labels were validated when the encodings were loaded
     student_id = match["student_id"]
-    name = validate_name(match["name"])
+    name = match["name"]
     confidence = match["confidence"]
 
-    if not db.get_student_info(student_id):
-        return _json_error("recognized student is not registered", 404)
-
-    exit_result = db.mark_exit_and_save_attendance(
+    registered, exit_result = db.mark_exit_if_registered(
         student_id=student_id,
         name=name,
         minimum_duration=_get_minimum_duration(),
         subject=subject,
     )
+    if not registered:
+        return _json_error("recognized student is not registered", 404)
     if not exit_result:
-        logger.warning(f"No active entry found for {name} ({student_id}) - subject: {subject}")
+        logger.warning("No active entry found for %s (%s) - subject: %s", name, student_id, subject)
         return _json_error(
             f"no active entry found for {name} in {subject} - please mark entry first for this subject",
             404
         )
+    _invalidate_attendance_caches()
 
     # Log successful exit with liveness status and subject
     liveness_status = "verified" if liveness_data else "not_checked"
     logger.info(
-        f"Exit marked: {name} ({student_id}) - subject: {exit_result.get('subject', subject)} - "
-        f"liveness: {liveness_status}, status: {exit_result['status']}"
+        "Exit marked: %s (%s) - subject: %s - liveness: %s, status: %s",
+        name, student_id, exit_result.get("subject", subject), liveness_status, exit_result["status"],
     )
 
     return jsonify(
@@ -852,14 +1176,14 @@ def mark_entry():
     name = validate_name(data.get("name"))
     subject = validate_subject(data.get("subject"), "subject", allow_empty=True)
     if not subject:
-        subject = db.get_setting("active_subject", config.DEFAULT_SUBJECT)
+        subject = _active_subject()
 
-    if not db.get_student_info(student_id):
+    registered, entry_result = db.mark_entry_if_registered(student_id, name, subject=subject)
+    if not registered:
         return _json_error("student not registered", 404)
-
-    entry_result = db.mark_entry(student_id, name, subject=subject)
     if not entry_result:
         return _json_error(f"{name} is already marked inside for {subject}", 409)
+    _invalidate_entry_caches()
 
     return jsonify(
         {
@@ -884,19 +1208,19 @@ def mark_exit():
     name = validate_name(data.get("name"))
     subject = validate_subject(data.get("subject"), "subject", allow_empty=True)
     if not subject:
-        subject = db.get_setting("active_subject", config.DEFAULT_SUBJECT)
-
-    if not db.get_student_info(student_id):
-        return _json_error("student not registered", 404)
+        subject = _active_subject()
 
-    exit_result = db.mark_exit_and_save_attendance(
+    registered, exit_result = db.mark_exit_if_registered(
         student_id=student_id,
         name=name,
         minimum_duration=_get_minimum_duration(),
         subject=subject,
     )
+    if not registered:
+        return _json_error("student not registered", 404)
     if not exit_result:
         return _json_error("no active entry found", 409)
+    _invalidate_attendance_caches()
 
     return jsonify(
         {
@@ -925,18 +1249,10 @@ def manual_attendance():
     status_override = data.get("status")
     subject = validate_subject(data.get("subject"), "subject", allow_empty=True)
     if not subject:
-        subject = db.get_setting("active_subject", config.DEFAULT_SUBJECT)
-
-    if not db.get_student_info(student_id):
-        return _json_error("student not registered", 404)
+        subject = _active_subject()
 
-    try:
-        entry_dt = datetime.strptime(entry_time, config.REPORT_DATETIME_FORMAT)
-        exit_dt = datetime.strptime(exit_time, config.REPORT_DATETIME_FORMAT)
-    except ValueError as exc:
-        raise ValidationError(
-            f"entry_time and exit_time must match {config.REPORT_DATETIME_FORMAT}"
-        ) from exc
+    entry_dt = parse_report_datetime(entry_time, "entry_time")
+    exit_dt = parse_report_datetime(exit_time, "exit_time")
 
     if exit_dt < entry_dt:
         raise ValidationError("exit_time cannot be earlier than entry_time")
@@ -946,11 +1262,11 @@ def manual_attendance():
     if status_override:
         status = validate_status(status_override)
     else:
-        attendance_mgr.minimum_duration = _get_minimum_duration()
-        status = attendance_mgr.determine_status(duration)
-    date = entry_dt.strftime(config.REPORT_DATE_FORMAT)
+        status = attendance_mgr.determine_status(duration, _get_minimum_duration())
+    # Same as strftime(REPORT_DATE_FORMAT) without the format-string walk
+    date = entry_dt.date().isoformat()
 
-    saved = db.upsert_attendance(
+    registered, saved = db.upsert_attendance_if_registered(
         student_id=student_id,
         name=name,
         entry_time=entry_time,
@@ -960,8 +1276,11 @@ def manual_attendance():
         date=date,
         subject=subject,
     )
+    if not registered:
+        return _json_error("student not registered", 404)
     if not saved:
         return _json_error("failed to save manual attendance", 500)
+    _invalidate_attendance_caches()
 
     return jsonify(
         {
@@ -980,22 +1299,30 @@ def manual_attendance():
 
 
 @app.route("/api/recent-entries")
+@conditional_on_db
+@cached_response
 def recent_entries():
     return jsonify({"success": True, "entries": _recent_entries_payload()})
 
 
 @app.route("/api/recent-exits")
+@conditional_on_db
+@cached_response
 def recent_exits():
     return jsonify({"success": True, "exits": _recent_exits_payload()})
 
 
 @app.route("/api/inside-students")
+@conditional_on_db
+@cached_response
 def inside_students():
     limit, _ = parse_limit_offset(request.args.get("limit"), 0)
     return jsonify({"success": True, "inside": _inside_payload(limit=limit)})
 
 
 @app.route("/api/analytics")
+@conditional_on_db
+@cached_response
 def analytics():
     from_date = validate_date(request.args.get("from_date"), "from_date")
     to_date = validate_date(request.args.get("to_date"), "to_date")
@@ -1008,17 +1335,20 @@ def get_students():
 
 
 @app.route("/api/get-today-attendance")
+@cached_response
 def get_today_attendance():
-    today = datetime.now().strftime(config.REPORT_DATE_FORMAT)
-    records = db.get_attendance_by_date(today)
-    return jsonify({"success": True, "attendance": _attendance_payload(records)})
+    today = _today_str()
+    records = db.get_attendance_by_date(today, as_dicts=True)
+    return jsonify({"success": True, "attendance": records})
 
 
 @app.route("/api/check-stale-entries")
 def check_stale_entries():
     """Check for stale entries (students still marked INSIDE after 24 hours)."""
-    max_age_hours = int(request.args.get("max_age_hours", 24))
+    max_age_hours = validate_max_age_hours(request.args.get("max_age_hours"))
     student_id = request.args.get("student_id")
+    if student_id:
+        student_id = validate_student_id(student_id)
     
     stale_entries = db.get_stale_entries(student_id=student_id, max_age_hours=max_age_hours)
     
@@ -1031,18 +1361,20 @@ def check_stale_entries():
 
 
 @app.route("/api/cleanup-stale-entries", methods=["POST"])
-def cleanup_stale_entries():
+@validate_json(
+    max_age_hours=validate_max_age_hours,
+    mark_as_absent=partial(_bool_from_any, default=True),
+)
+def cleanup_stale_entries(max_age_hours, mark_as_absent):
     """Automatically cleanup stale entries (admin function)."""
-    data = _json_body()
-    max_age_hours = int(data.get("max_age_hours", 24))
-    mark_as_absent = data.get("mark_as_absent", True)
-    
     cleaned_count = db.auto_cleanup_stale_entries(
         max_age_hours=max_age_hours,
         mark_as_absent=mark_as_absent
     )
+    if cleaned_count:
+        _invalidate_attendance_caches()
     
-    logger.info(f"Stale entries cleanup: {cleaned_count} entries processed")
+    logger.info("Stale entries cleanup: %d entries processed", cleaned_count)
     
     return jsonify({
         "success": True,
@@ -1073,19 +1405,28 @@ def get_attendance():
         subject=subject,
         limit=limit,
         offset=offset,
+        as_dicts=True,
     )
 
-    return jsonify(
-        {
-            "success": True,
-            "records": _attendance_payload(records),
-            "total": total,
-            "limit": limit,
-            "offset": offset,
-            "subject": subject,
-        }
+    tail = app.json.dumps(
+        {"total": total, "limit": limit, "offset": offset, "subject": subject}
     )
 
+    def generate():
+        # Serialize in chunks instead of building the whole payload first;
+        # chunking keeps the number of socket writes low
+        yield '{"success": true, "records": ['
+        dumps = app.json.dumps
+        for start in range(0, len(records), _STREAM_CHUNK_ROWS):
+            chunk = ",".join(
+                dumps(row)
+                for row in records[start:start + _STREAM_CHUNK_ROWS]
+            )
+            yield ("," if start else "") + chunk
+        yield "], " + tail[1:]
+
+    return app.response_class(stream_with_context(generate()), mimetype="application/json")
+
 
 @app.route("/api/student-attendance")
 def api_student_attendance():
@@ -1097,12 +1438,15 @@ def api_student_attendance():
     if not student:
         return _json_error("student not registered", 404)
 
+    # Independent reads on separate connections - run the summary alongside the records
+    summary_future = _query_executor.submit(db.get_student_subject_summary, student_id)
     records = db.get_student_subject_records(
         student_id=student_id,
         subject=subject,
         limit=limit,
+        as_dicts=True,
     )
-    summary = db.get_student_subject_summary(student_id)
+    summary = summary_future.result()
 
     return jsonify(
         {
@@ -1115,17 +1459,15 @@ def api_student_attendance():
             },
             "subject": subject,
             "subject_summary": summary,
-            "records": _attendance_payload(records),
+            "records": records,
         }
     )
 
 
 @app.route("/api/generate-report", methods=["POST"])
-def api_generate_report():
-    data = _json_body()
-    report_type = (data.get("type") or "daily").strip().lower()
-    date = validate_date(data.get("date"), "date")
-    subject = validate_subject(data.get("subject"), "subject", allow_empty=True)
+@validate_json(date=validate_date, subject=_optional_subject)
+def api_generate_report(date, subject):
+    report_type = (_json_body().get("type") or "daily").strip().lower()
 
     if report_type == "daily":
         report_path = report_gen.generate_daily_report(date, subject=subject)
@@ -1134,6 +1476,11 @@ def api_generate_report():
     else:
         raise ValidationError("type must be 'daily' or 'csv'")
 
+    try:
+        report_gen.write_gzip_copy(report_path)
+    except OSError as e:
+        logger.warning("Could not precompress report %s: %s", report_path, e)
+
     file_name = os.path.basename(report_path)
     return jsonify(
         {
@@ -1154,10 +1501,40 @@ def download_report():
 
     safe_name = os.path.basename(file_name)
     full_path = os.path.join(config.REPORTS_PATH, safe_name)
-    if not os.path.exists(full_path):
+    try:
+        report_stat = os.stat(full_path)
+    except OSError:
+        report_stat = None
+    if report_stat is None or not stat.S_ISREG(report_stat.st_mode):
         return _json_error("report file not found", 404)
 
-    return send_from_directory(config.REPORTS_PATH, safe_name, as_attachment=True)
+    # Serve the precompressed copy when the client accepts gzip and it is current
+    served_path = full_path
+    if "gzip" in request.accept_encodings:
+        gzip_path = full_path + ".gz"
+        try:
+            if os.stat(gzip_path).st_mtime >= report_stat.st_mtime:
+                served_path = gzip_path
+        except OSError:
+            pass
+
+    # safe_name is a bare basename, so the path needs no second safe_join. Reports
+    # are regenerated under the same name, so always revalidate: the mtime/size
+    # ETag turns repeat downloads into 304s without serving stale files.
+    # send_file hands the file to wsgi.file_wrapper (sendfile under Waitress/gunicorn).
+    response = send_file(
+        served_path,
+        as_attachment=True,
+        download_name=safe_name,
+        mimetype=mimetypes.guess_type(safe_name)[0] or "application/octet-stream",
+        conditional=True,
+        etag=True,
+        max_age=0,
+    )
+    if served_path != full_path:
+        response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    return response
 
 
 # Admin routes
@@ -1168,23 +1545,19 @@ def admin_page():
 
 
 @app.route("/api/admin/students")
+@cached_response
 def api_admin_students():
     """Get all students with complete information for admin view."""
-    students = db.get_all_students()
     result = []
-    for student in students:
-        student_id = student[0]
-        # Get attendance stats for each student
-        summary = db.get_student_subject_summary(student_id)
-        total_classes = sum(s["total_classes"] for s in summary)
-        present_classes = sum(s["present_classes"] for s in summary)
+    for student_id, name, roll_number, registered_date, total_classes, present_classes in (
+        db.get_all_students_with_stats()
+    ):
         overall_rate = round((present_classes / total_classes) * 100, 2) if total_classes else 0.0
-        
         result.append({
-            "student_id": student[0],
-            "name": student[1],
-            "roll_number": student[2],
-            "registered_date": student[3],
+            "student_id": student_id,
+            "name": name,
+            "roll_number": roll_number,
+            "registered_date": registered_date,
             "total_classes": total_classes,
             "attendance_rate": overall_rate
         })
@@ -1192,12 +1565,69 @@ def api_admin_students():
     return jsonify({"success": True, "students": result})
 
 
+def _trash_dataset_folder(student_id):
+    """Move a deleted student's images out of the dataset with one rename.
+
+    Returns the folder left to delete, or None if the student had no images.
+    """
+    dataset_folder = _safe_dataset_folder(student_id)
+    if not os.path.isdir(dataset_folder):
+        return None
+    trash_folder = os.path.join(config.DATASET_TRASH_PATH, f"{student_id}.{time.time_ns()}")
+    try:
+        os.makedirs(config.DATASET_TRASH_PATH, exist_ok=True)
+        os.replace(dataset_folder, trash_folder)
+    except OSError as e:
+        # e.g. trash on another filesystem - delete in place instead
+        logger.warning("Could not move dataset folder for %s to trash: %s", student_id, e)
+        return dataset_folder
+    return trash_folder
+
+
+def _purge_dataset_trash():
+    """Delete folders left in the dataset trash, e.g. by a restart mid-cleanup."""
+    try:
+        with os.scandir(config.DATASET_TRASH_PATH) as entries:
+            folders = [entry.path for entry in entries if entry.is_dir(follow_symlinks=False)]
+    except FileNotFoundError:
+        return 0
+    for folder in folders:
+        shutil.rmtree(folder, ignore_errors=True)
+    return len(folders)
+
+
+def _ignore_missing(function, path, exc_info):
+    """rmtree error handler: files already removed by a concurrent trash purge are fine."""
+    if not issubclass(exc_info[0], FileNotFoundError):
+        raise exc_info[1]
+
+
+def _remove_student_files(student_id, dataset_folder):
+    """Delete a removed student's image folder and encodings (runs in the background)."""
+    # Delete student's dataset folder
+    if dataset_folder:
+        try:
+            shutil.rmtree(dataset_folder, onerror=_ignore_missing)
+            logger.info("Deleted dataset folder for student: %s", student_id)
+        except Exception as e:
+            logger.error("Error deleting dataset folder for %s: %s", student_id, e)
+            # Continue anyway, database deletion is more important
+    
+    # Remove student's encodings efficiently (no re-encoding needed)
+    try:
+        with _encoder_lock:
+            encoder.remove_student_encodings(student_id)
+        recognizer.load_encodings(force=True)
+        logger.info("Removed encodings for %s - no re-encoding needed", student_id)
+    except Exception as e:
+        logger.error("Error removing encodings for %s: %s", student_id, e)
+        # Continue anyway, the student is already deleted from database
+
+
 @app.route("/api/admin/delete-student", methods=["POST"])
-def api_admin_delete_student():
+@validate_json(student_id=validate_student_id)
+def api_admin_delete_student(student_id):
     """Delete a student and all their data (encodings, images, database records)."""
-    data = _json_body()
-    student_id = validate_student_id(data.get("student_id"))
-    
     # Check if student exists
     student = db.get_student_info(student_id)
     if not student:
@@ -1206,27 +1636,17 @@ def api_admin_delete_student():
     # Delete from database
     if not db.delete_student(student_id):
         return _json_error("failed to delete student from database", 500)
+    _invalidate_student_caches()
     
-    # Delete student's dataset folder
+    # Renaming is O(1) and frees the student_id folder for a re-registration right away
     try:
-        dataset_folder = _safe_dataset_folder(student_id)
-        if os.path.exists(dataset_folder):
-            import shutil
-            shutil.rmtree(dataset_folder)
-            logger.info(f"Deleted dataset folder for student: {student_id}")
-    except Exception as e:
-        logger.error(f"Error deleting dataset folder for {student_id}: {e}")
-        # Continue anyway, database deletion is more important
-    
-    # Remove student's encodings efficiently (no re-encoding needed)
-    try:
-        encoder = FaceEncoder()
-        encoder.remove_student_encodings(student_id)
-        recognizer.load_encodings(force=True)
-        logger.info(f"Removed encodings for {student_id} - no re-encoding needed")
+        dataset_folder = _trash_dataset_folder(student_id)
     except Exception as e:
-        logger.error(f"Error removing encodings for {student_id}: {e}")
-        # Continue anyway, the student is already deleted from database
+        logger.error("Error moving dataset folder for %s: %s", student_id, e)
+        dataset_folder = None
+
+    # Images and encodings are cleaned up off the request thread
+    _background_executor.submit(_remove_student_files, student_id, dataset_folder)
     
     return jsonify({
         "success": True,
@@ -1235,34 +1655,76 @@ def api_admin_delete_student():
     })
 
 
-def startup_cleanup():
-    """Run cleanup tasks on application startup."""
+def _cleanup_stale_entries(label):
     try:
         # Clean up stale entries from previous days
         cleaned = db.auto_cleanup_stale_entries(max_age_hours=24, mark_as_absent=True)
-        if cleaned > 0:
-            logger.info(f"Startup cleanup: Processed {cleaned} stale entries")
     except Exception as e:
-        logger.error(f"Startup cleanup failed: {e}")
+        logger.error("%s failed: %s", label, e)
+        return
+    if cleaned > 0:
+        _invalidate_attendance_caches()
+        logger.info("%s: Processed %s stale entries", label, cleaned)
 
 
-if __name__ == "__main__":
+def _maintenance_loop():
+    while not _maintenance_stop.wait(config.STALE_CLEANUP_INTERVAL_SECONDS):
+        _cleanup_stale_entries("Scheduled cleanup")
+        try:
+            _purge_dataset_trash()
+        except Exception as e:
+            logger.error("Scheduled trash purge failed: %s", e)
+
+
+def start_maintenance_thread():
+    """Start the periodic cleanup thread for this serving process.
+
+    Called after startup_cleanup() by run_server()/run_waitress(), and from the
+    gunicorn post_worker_init hook so a preloading master never runs it.
+    """
+    global _maintenance_thread
+    if config.STALE_CLEANUP_INTERVAL_SECONDS <= 0:
+        return
+    with _maintenance_lock:
+        if _maintenance_thread is None:
+            _maintenance_thread = Thread(target=_maintenance_loop, name="maintenance", daemon=True)
+            _maintenance_thread.start()
+
+
+def startup_cleanup():
+    """Run cleanup tasks on application startup."""
+    _cleanup_stale_entries("Startup cleanup")
+
+    purged = _purge_dataset_trash()
+    if purged:
+        logger.info("Startup cleanup: Removed %d deleted student folders", purged)
+
+
+def run_server():
+    """Create data directories, run startup cleanup and serve (see start_server.run_development)."""
     os.makedirs(config.DATASET_PATH, exist_ok=True)
     os.makedirs(config.ENCODINGS_PATH, exist_ok=True)
     os.makedirs(config.DATABASE_PATH, exist_ok=True)
     os.makedirs(config.LOGS_PATH, exist_ok=True)
     os.makedirs(config.REPORTS_PATH, exist_ok=True)
 
-    # Run startup cleanup
+    # Run startup cleanup, then keep cleaning up while the server runs
     startup_cleanup()
+    start_maintenance_thread()
 
-    # Enable threaded mode for concurrent request handling
-    # This allows multiple students to mark entry/exit simultaneously
-    app.run(
-        debug=config.FLASK_DEBUG, 
-        host=config.FLASK_HOST, 
-        port=config.FLASK_PORT,
-        threaded=True,  # Enable multi-threading for concurrent requests
-        use_reloader=False  # Disable reloader to prevent double cleanup
-    )
+    if config.USE_GEVENT:
+        # Cooperative server - requests waiting on SQLite or disk yield to each other
+        from gevent.pywsgi import WSGIServer
 
+        logger.info("Serving with gevent on %s:%s", config.FLASK_HOST, config.FLASK_PORT)
+        WSGIServer((config.FLASK_HOST, config.FLASK_PORT), app).serve_forever()
+    else:
+        # Enable threaded mode for concurrent request handling
+        # This allows multiple students to mark entry/exit simultaneously
+        app.run(
+            debug=config.FLASK_DEBUG, 
+            host=config.FLASK_HOST, 
+            port=config.FLASK_PORT,
+            threaded=True,  # Enable multi-threading for concurrent requests
+            use_reloader=False  # Disable reloader to prevent double cleanup
+        )
@@ -6,8 +6,16 @@ import logging
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+if __name__ == "__main__":
+    # For local development with waitress. Served through the guarded launcher
+    # so spawned face detection workers don't re-run this module (see web/app.py)
+    import start_server
+
+    start_server.run_as_main(start_server.run_waitress)
+    sys.exit(0)
+
 import src.config as config
-from app import app, startup_cleanup
+from app import app, start_maintenance_thread, startup_cleanup
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +34,3 @@ logger.info("Startup cleanup complete")
 # Export app for WSGI servers (gunicorn, waitress, etc.)
 # Usage: gunicorn web.wsgi:app
 # This ensures startup_cleanup runs before serving requests
-
-if __name__ == "__main__":
-    # For local development with waitress
-    from waitress import serve
-    serve(app, host=config.FLASK_HOST, port=config.FLASK_PORT)